@@ -1,17 +1,40 @@
 # auth.py
 
+import os
 import bcrypt
 import logging
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
 from models import User
 
 logger = logging.getLogger(__name__)
 
-def hash_password(plain: str) -> str:
+# Стоимость bcrypt (log2 числа раундов). Каждая единица удваивает время
+# хэширования и проверки. Задаётся переменной окружения HR_BCRYPT_ROUNDS;
+# при входе хэши с другой стоимостью пересчитываются под текущую политику.
+BCRYPT_ROUNDS = int(os.environ.get("HR_BCRYPT_ROUNDS", "12"))
+
+def hash_password(plain: str, rounds: int = None) -> str:
     """
     Хэширует пароль с помощью bcrypt и возвращает строку.
+    rounds — стоимость bcrypt (по умолчанию BCRYPT_ROUNDS).
+    """
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(plain.encode('utf-8'), salt).decode('utf-8')
+
+def hash_rounds(hashed: str):
+    """
+    Возвращает стоимость из bcrypt-хэша вида $2b$12$... или None,
+    если строка не похожа на bcrypt-хэш.
     """
-    return bcrypt.hashpw(plain.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    parts = hashed.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def needs_rehash(hashed: str) -> bool:
+    """Нужно ли пересчитать хэш под текущую политику BCRYPT_ROUNDS."""
+    return hash_rounds(hashed) != BCRYPT_ROUNDS
 
 def verify_password(plain: str, hashed: str) -> bool:
     """
@@ -23,16 +46,35 @@ def verify_password(plain: str, hashed: str) -> bool:
         logger.error(f"Ошибка проверки пароля: {e}")
         return False
 
+def _rehash(db: Session, user: User, password: str) -> None:
+    """
+    Пересчитывает хэш пароля под текущую политику.
+    Ошибка записи не мешает входу — хэш обновится при следующем.
+    """
+    old_rounds = hash_rounds(user.password)
+    try:
+        user.password = hash_password(password)
+        db.commit()
+        db.refresh(user)
+        logger.info(f"Хэш пароля {user.username} пересчитан: {old_rounds} -> {BCRYPT_ROUNDS}")
+    except SQLAlchemyError as e:
+        db.rollback()
+        db.refresh(user)
+        logger.warning(f"Не удалось пересчитать хэш пароля {user.username}: {e}")
+
 def authenticate(db: Session, username: str, password: str):
     """
     Аутентификация пользователя:
     - ищет User по username,
     - проверяет пароль,
+    - пересчитывает хэш, если его стоимость отличается от BCRYPT_ROUNDS,
     - возвращает объект User или None.
     """
     user = db.query(User).filter(User.username == username).first()
     if user and verify_password(password, user.password):
         logger.info(f"Аутентификация успешна: {username}")
+        if needs_rehash(user.password):
+            _rehash(db, user, password)
         return user
     logger.warning(f"Аутентификация не удалась: {username}")
     return None
@@ -49,3 +91,15 @@ def register_user(db: Session, username: str, password: str, role: str = "employ
     db.refresh(user)
     logger.info(f"Зарегистрирован пользователь: {username} ({role})")
     return user
+
+def ensure_user(db: Session, username: str, password: str, role: str = "employee"):
+    """
+    Создаёт пользователя, только если логин ещё свободен: наличие
+    проверяется дешёвым запросом по индексу username, а bcrypt-хэш
+    считается лишь для нового пользователя.
+    Возвращает User (существующий или созданный).
+    """
+    user = db.query(User).filter(User.username == username).first()
+    if user is not None:
+        return user
+    return register_user(db, username=username, password=password, role=role)
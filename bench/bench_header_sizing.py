@@ -0,0 +1,109 @@
+# bench/bench_header_sizing.py
+"""
+Ширины колонок таблицы сотрудников: QHeaderView.ResizeToContents
+против ui.header_sizing.ContentHeaderSizer (самые длинные тексты модели
+и выборка строк) на синтетических строках, без БД.
+
+Для каждого объёма замеряется:
+- reset — загрузка всех строк в EmployeeTableModel (сброс модели)
+  и обработка событий до готовой отрисовки окна;
+- append — подгрузка ещё одной страницы (fetchMore) после полной загрузки.
+Режим fixed (ширины не считаются) показывает стоимость самой модели.
+
+Запуск из корня проекта:
+    python bench/bench_header_sizing.py --sizes 10000 100000 --offscreen
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def fake_rows(start: int, n: int):
+    """Строки list_employee_rows_page без БД (длина ФИО и должности разная)."""
+    return [
+        SimpleNamespace(
+            id=i,
+            username=f"user{i}",
+            first_name=f"Имя{i % 300}",
+            last_name="Фамилия" + "о" * (i % 17),
+            position=f"Должность {i % 40}" + (" (совместитель)" if i % 97 == 0 else ""),
+            hire_date=datetime.date(2000 + i % 25, 1 + i % 12, 1 + i % 28),
+            vacation_days_left=i % 30,
+        )
+        for i in range(start, start + n)
+    ]
+
+def settle(app):
+    # Отложенные раскладки QHeaderView/QTableView идут через очередь событий
+    for _ in range(3):
+        app.processEvents()
+
+def measure(app, mode: str, n: int, page_size: int, appends: int):
+    from PyQt5.QtWidgets import QHeaderView, QTableView
+    from controllers import EmployeePage
+    from ui.header_sizing import ContentHeaderSizer
+    from ui.models_table import EmployeeTableModel
+
+    model = EmployeeTableModel([])
+    view = QTableView()
+    view.setWordWrap(True)
+    view.setModel(model)
+    header = view.horizontalHeader()
+    header.setStretchLastSection(True)
+    if mode == "contents":
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+    elif mode == "sampled":
+        ContentHeaderSizer(view)
+    view.resize(1200, 700)
+    view.show()
+    settle(app)
+
+    rows = fake_rows(1, n)
+    fetched = [n + 1]
+
+    def fetch_page(after_id):
+        page = fake_rows(fetched[0], page_size)
+        fetched[0] += page_size
+        return EmployeePage(page, page[-1].id, None)
+
+    start = time.perf_counter()
+    model.update_page(EmployeePage(rows, rows[-1].id, n), fetch_page)
+    settle(app)
+    reset = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(appends):
+        model.fetchMore()
+        settle(app)
+    append = (time.perf_counter() - start) / max(appends, 1)
+    widths = [header.sectionSize(c) for c in range(model.columnCount())]
+    view.close()
+    view.deleteLater()
+    settle(app)
+    return reset, append, widths
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--appends", type=int, default=5, help="сколько страниц подгрузить после загрузки")
+    parser.add_argument("--offscreen", action="store_true", help="QT_QPA_PLATFORM=offscreen (без дисплея)")
+    args = parser.parse_args()
+
+    if args.offscreen:
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    print(f"{'rows':>8}  {'mode':<10}{'reset, s':>10}{'append, ms':>12}  widths, px")
+    for n in args.sizes:
+        for mode in ("fixed", "contents", "sampled"):
+            reset, append, widths = measure(app, mode, n, args.page_size, args.appends)
+            print(f"{n:>8}  {mode:<10}{reset:>10.3f}{append * 1000:>12.1f}  {widths}")
+
+if __name__ == "__main__":
+    main()
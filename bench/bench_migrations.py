@@ -0,0 +1,87 @@
+# bench/bench_migrations.py
+"""
+Время обновления схемы hr.db на месте (migrations.migrate):
+- синтетическая БД с --rows сотрудниками приводится к версии 0
+  (без индексов из миграций, user_version = 0), как у старой установки;
+- замеряются миграции приложения (CREATE INDEX, ANALYZE),
+  ALTER TABLE ADD COLUMN и полная пересборка employees (rebuild_table)
+  для сравнения.
+
+Запуск из корня проекта:
+    python bench/bench_migrations.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import make_engine, init_db
+from migrations import MIGRATIONS, Migration, add_column, migrate, rebuild_table
+from bench_sqlite_profiles import seed
+
+def downgrade_to_v0(engine):
+    """Удаляет индексы, которые добавляют миграции, и сбрасывает версию схемы."""
+    with engine.begin() as conn:
+        names = [
+            name for (name,) in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'employees' "
+                "AND name LIKE 'ix_employees_%' AND name != 'ix_employees_id'"
+            )
+        ]
+        for name in names:
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+        conn.exec_driver_sql("DROP TABLE IF EXISTS sqlite_stat1")
+        conn.exec_driver_sql("PRAGMA user_version = 0")
+
+def report(title, results, seconds):
+    print(f"{title}: {seconds:.2f} с")
+    for result in results:
+        print(f"  v{result.version:<4}{result.seconds:>8.2f} с  {result.description}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = make_engine(f"sqlite:///{os.path.join(workdir, 'migrate.db')}")
+        init_db(engine)
+        start = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"rows={args.rows} (заполнение {time.perf_counter() - start:.1f} с)")
+        downgrade_to_v0(engine)
+
+        start = time.perf_counter()
+        results = migrate(engine)
+        report("Миграции приложения", results, time.perf_counter() - start)
+
+        with engine.connect() as conn:
+            create_sql = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'employees'"
+            ).scalar()
+        base = MIGRATIONS[-1].version
+        extra = MIGRATIONS + (
+            Migration(base + 1, "ADD COLUMN (на месте)", (
+                add_column("employees", "bench_flag", "INTEGER NOT NULL DEFAULT 0"),
+            )),
+            Migration(base + 2, "пересборка employees", (
+                rebuild_table("employees", create_sql.replace("CREATE TABLE employees", "CREATE TABLE {table}", 1)),
+            )),
+        )
+        start = time.perf_counter()
+        results = migrate(engine, extra)
+        report("Сравнение способов изменения таблицы", results, time.perf_counter() - start)
+
+        with engine.connect() as conn:
+            count = conn.exec_driver_sql("SELECT count(*) FROM employees").scalar()
+            triggers = conn.exec_driver_sql(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'employees'"
+            ).scalar()
+        print(f"Строк после пересборки: {count}, триггеров: {triggers}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
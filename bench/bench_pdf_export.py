@@ -0,0 +1,63 @@
+# bench/bench_pdf_export.py
+"""
+Сравнение export_employees_pdf (одна таблица на весь отчёт) и
+export_employees_pdf_stream (таблица на страницу из итератора):
+время и пиковая память Python (tracemalloc) на синтетических данных.
+
+Запуск из корня проекта:
+    python bench/bench_pdf_export.py --sizes 1000 10000 100000 --legacy-max 10000
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reports import export_employees_pdf, export_employees_pdf_stream
+
+def fake_employees(n: int):
+    """Генератор строк сотрудников без БД."""
+    for i in range(1, n + 1):
+        yield SimpleNamespace(
+            id=i,
+            first_name=f"Имя{i % 300}",
+            last_name=f"Фамилия{i}",
+            position=f"Должность {i % 40}",
+            hire_date=datetime.date(2000 + i % 25, 1 + i % 12, 1 + i % 28),
+            vacation_days_left=i % 30,
+        )
+
+def measure(fn, path, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(path, fake_employees(n))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-max", type=int, default=10000,
+                        help="не запускать старый экспорт на больших объёмах")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'mode':<8}{'time, s':>10}{'peak, MiB':>12}")
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "report.pdf")
+        for n in args.sizes:
+            modes = [("stream", export_employees_pdf_stream)]
+            if n <= args.legacy_max:
+                modes.insert(0, ("legacy", export_employees_pdf))
+            for name, fn in modes:
+                elapsed, peak = measure(fn, path, n)
+                print(f"{n:>8}  {name:<8}{elapsed:>10.2f}{peak:>12.1f}")
+
+if __name__ == "__main__":
+    main()
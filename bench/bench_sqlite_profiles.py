@@ -0,0 +1,84 @@
+# bench/bench_sqlite_profiles.py
+"""
+Сравнение профилей SQLite из database.ENGINE_PROFILES:
+пропускная способность постраничного чтения списка сотрудников
+и одиночных обновлений (каждое — отдельный коммит).
+
+Запуск из корня проекта:
+    python bench/bench_sqlite_profiles.py --rows 20000 --updates 500
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+from database import ENGINE_PROFILES, make_engine, init_db
+from controllers import list_employees_page, update_employee
+
+def seed(engine, rows: int):
+    """Быстрое заполнение БД синтетическими сотрудниками."""
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO users (id, username, password, role) VALUES (?, ?, ?, ?)",
+            [(i, f"user{i}", "x", "employee") for i in range(1, rows + 1)],
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO employees (id, user_id, first_name, last_name, position, passport, "
+            "hire_date, vacation_days_left) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (i, i, f"Имя{i % 300}", f"Фамилия{i}", f"Должность{i % 40}", "1234 567890",
+                 datetime.date(2000 + i % 25, 1 + i % 12, 1 + i % 28).isoformat(), i % 30)
+                for i in range(1, rows + 1)
+            ],
+        )
+
+def bench_profile(profile: str, rows: int, updates: int, workdir: str):
+    path = os.path.join(workdir, f"bench_{profile}.db")
+    engine = make_engine(f"sqlite:///{path}", profile)
+    init_db(engine)
+    seed(engine, rows)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    start = time.perf_counter()
+    loaded = 0
+    with Session() as db:
+        cursor = None
+        while True:
+            page = list_employees_page(db, after_id=cursor)
+            loaded += len(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    list_rate = loaded / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with Session() as db:
+        for i in range(updates):
+            update_employee(db, 1 + (i * 7919) % rows, vacation_days_left=i % 30)
+    update_rate = updates / (time.perf_counter() - start)
+
+    engine.dispose()
+    return list_rate, update_rate
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--profiles", nargs="+", default=list(ENGINE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"rows={args.rows} updates={args.updates}")
+    print(f"{'profile':<12}{'list, rows/s':>16}{'update, ops/s':>16}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for profile in args.profiles:
+            list_rate, update_rate = bench_profile(profile, args.rows, args.updates, workdir)
+            print(f"{profile:<12}{list_rate:>16,.0f}{update_rate:>16,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench/bench_startup.py
+"""
+Время запуска приложения до окна входа.
+main.py запускается в отдельном процессе с python -X importtime
+и переменной HR_STARTUP_PROBE: приложение закрывается сразу после
+показа окна входа и пишет в лог, сколько заняла main().
+Первый запуск — на пустой БД (создание схемы и пользователя da с bcrypt),
+остальные — на уже созданной. В конце — самые тяжёлые импорты.
+
+Запуск из корня проекта:
+    python bench/bench_startup.py --runs 5 --offscreen
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+LOGIN_SHOWN = re.compile(r"Окно входа показано через ([\d.]+) с")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+def run_once(workdir: str, env: dict):
+    """Один запуск: (время процесса, время main() до окна входа, строки importtime)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN],
+        cwd=workdir, env=env, capture_output=True, text=True, encoding="utf-8",
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"main.py завершился с кодом {proc.returncode}:\n{proc.stderr[-2000:]}")
+    shown = LOGIN_SHOWN.search(proc.stderr)
+    imports = []
+    for line in proc.stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        if m:
+            # Вложенность — по отступу перед именем модуля
+            depth = (len(m.group(3)) - 1) // 2
+            imports.append((int(m.group(2)), depth, m.group(4)))
+    return wall, float(shown.group(1)) if shown else None, imports
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="запусков на созданной БД")
+    parser.add_argument("--top", type=int, default=10, help="сколько тяжёлых импортов показать")
+    parser.add_argument("--offscreen", action="store_true", help="QT_QPA_PLATFORM=offscreen (без дисплея)")
+    args = parser.parse_args()
+
+    env = dict(os.environ, HR_STARTUP_PROBE="1")
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'запуск':<12}{'процесс, с':>12}{'main(), с':>12}")
+        wall, shown, imports = run_once(workdir, env)
+        print(f"{'пустая БД':<12}{wall:>12.3f}{shown or float('nan'):>12.3f}")
+        walls, shows = [], []
+        for i in range(args.runs):
+            wall, shown, imports = run_once(workdir, env)
+            walls.append(wall)
+            shows.append(shown or float("nan"))
+            print(f"{'#' + str(i + 1):<12}{wall:>12.3f}{shows[-1]:>12.3f}")
+        if walls:
+            walls.sort()
+            shows.sort()
+            print(f"{'медиана':<12}{walls[len(walls) // 2]:>12.3f}{shows[len(shows) // 2]:>12.3f}")
+
+    # Модули, импортированные напрямую из main.py, по суммарному времени
+    top_level = [(us, name) for us, depth, name in imports if depth == 0]
+    total = sum(us for us, _ in top_level)
+    print(f"\nИмпорты (последний запуск), всего {total / 1e6:.3f} с:")
+    for us, name in sorted(top_level, reverse=True)[:args.top]:
+        print(f"  {us / 1e6:>8.3f} с  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# bench/bench_vacation_accrual.py
+"""
+Начисление отпуска (services.vacation_accrual) на синтетической БД:
+пробный прогон plan() и начисление accrue() одним UPDATE, для сравнения —
+то же начисление по одному ORM-объекту (как при правке в EditWidget).
+
+Запуск из корня проекта:
+    python bench/bench_vacation_accrual.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from bench_sqlite_profiles import seed
+from database import make_engine, init_db
+from models import Employee
+from services.vacation_accrual import POLICIES, accrue, plan
+
+def accrue_per_object(db, year: int, policy):
+    """Эталон: тот же расчёт в Python по каждому объекту."""
+    for emp in db.scalars(select(Employee)):
+        if emp.hire_date is None or emp.hire_date.year > year:
+            continue
+        if emp.vacation_accrued_year is not None and emp.vacation_accrued_year >= year:
+            continue
+        service = year - emp.hire_date.year
+        bonus = max((days for years, days in policy.seniority_bonus if service >= years), default=0)
+        base = policy.base_days
+        if policy.prorate_first_year and service == 0:
+            base = round(policy.base_days * (13 - emp.hire_date.month) / 12.0)
+        carried = emp.vacation_days_left or 0
+        if policy.carry_over_cap is not None:
+            carried = min(carried, policy.carry_over_cap)
+        emp.vacation_days_left = carried + base + bonus
+        emp.vacation_accrued_year = year
+    db.commit()
+
+def fresh_db(workdir: str, name: str, rows: int):
+    path = os.path.join(workdir, name)
+    engine = make_engine(f"sqlite:///{path}")
+    init_db(engine)
+    seed(engine, rows)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--year", type=int, default=2026)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="capped")
+    parser.add_argument("--skip-orm", action="store_true", help="не замерять начисление по объектам")
+    args = parser.parse_args()
+    policy = POLICIES[args.policy]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        Session = fresh_db(workdir, "accrual.db", args.rows)
+        with Session() as db:
+            start = time.perf_counter()
+            dry = plan(db, args.year, policy)
+            plan_time = time.perf_counter() - start
+            start = time.perf_counter()
+            done = accrue(db, args.year, policy)
+            accrue_time = time.perf_counter() - start
+            expected = {d.emp_id: d.new for d in dry.diffs}
+            actual = dict(db.execute(select(Employee.id, Employee.vacation_days_left)).all())
+            assert all(actual[i] == v for i, v in expected.items()), "plan() и accrue() разошлись"
+            assert accrue(db, args.year, policy).affected == 0, "повторное начисление"
+        print(f"plan:   {plan_time:.3f} s, {dry.affected} сотрудников, +{dry.added_days} дн.")
+        print(f"accrue: {accrue_time:.3f} s, {done.affected} сотрудников, +{done.added_days} дн.")
+
+        if not args.skip_orm:
+            Session = fresh_db(workdir, "accrual_orm.db", args.rows)
+            with Session() as db:
+                start = time.perf_counter()
+                accrue_per_object(db, args.year, policy)
+                orm_time = time.perf_counter() - start
+                actual = dict(db.execute(select(Employee.id, Employee.vacation_days_left)).all())
+                assert all(actual[i] == v for i, v in expected.items()), "эталон и accrue() разошлись"
+            print(f"orm:    {orm_time:.3f} s")
+
+if __name__ == "__main__":
+    main()
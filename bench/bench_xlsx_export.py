@@ -0,0 +1,50 @@
+# bench/bench_xlsx_export.py
+"""
+Сравнение export_employees_excel (обычная книга, ширины и выравнивание
+обходом всех ячеек) и export_employees_excel_stream (write-only книга,
+именованный стиль): время и пиковая память Python (tracemalloc).
+
+Запуск из корня проекта:
+    python bench/bench_xlsx_export.py --sizes 10000 100000 300000 --legacy-max 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reports import export_employees_excel, export_employees_excel_stream
+from bench_pdf_export import fake_employees
+
+def measure(fn, path, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(path, fake_employees(n))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 300000])
+    parser.add_argument("--legacy-max", type=int, default=100000,
+                        help="не запускать старый экспорт на больших объёмах")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'mode':<8}{'time, s':>10}{'peak, MiB':>12}")
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "report.xlsx")
+        for n in args.sizes:
+            modes = [("stream", export_employees_excel_stream)]
+            if n <= args.legacy_max:
+                modes.insert(0, ("legacy", export_employees_excel))
+            for name, fn in modes:
+                elapsed, peak = measure(fn, path, n)
+                print(f"{n:>8}  {name:<8}{elapsed:>10.2f}{peak:>12.1f}")
+
+if __name__ == "__main__":
+    main()
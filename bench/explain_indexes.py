@@ -0,0 +1,111 @@
+# bench/explain_indexes.py
+"""
+Проверка планов запросов: реальные запросы таблицы и фильтров
+(controllers) перехватываются при выполнении на синтетической БД
+и прогоняются через EXPLAIN QUERY PLAN. Для каждого запроса
+проверяется, что SQLite читает ожидаемый индекс, а не всю таблицу.
+Код возврата 1, если хотя бы один план не совпал.
+
+Запуск из корня проекта:
+    python bench/explain_indexes.py --rows 20000 -v
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from database import make_engine, init_db
+from controllers import (
+    EmployeeFilter,
+    EmployeeSort,
+    count_employees,
+    list_employee_rows_page,
+    list_positions,
+)
+from bench_sqlite_profiles import seed
+
+# (название, вызов контроллера, допустимые индексы — хотя бы один должен быть в плане)
+CHECKS = [
+    ("сортировка по фамилии",
+     lambda db: list_employee_rows_page(db, sort=EmployeeSort("last_name")),
+     ("ix_employees_last_name",)),
+    ("сортировка по дате приёма (убыв.), вторая страница",
+     lambda db: list_employee_rows_page(
+         db, after_id=(datetime.date(2010, 1, 1), 500), sort=EmployeeSort("hire_date", True)),
+     ("ix_employees_hire_date",)),
+    ("сортировка по должности",
+     lambda db: list_employee_rows_page(db, sort=EmployeeSort("position")),
+     ("ix_employees_position", "ix_employees_position_hire_date")),
+    ("сортировка по остатку отпуска",
+     lambda db: list_employee_rows_page(db, sort=EmployeeSort("vacation_days_left")),
+     ("ix_employees_vacation_days_left",)),
+    ("сортировка по логину",
+     lambda db: list_employee_rows_page(db, sort=EmployeeSort("username", True)),
+     ("ix_users_username", "sqlite_autoindex_users_1")),
+    ("фильтр: должность + диапазон дат",
+     lambda db: list_employee_rows_page(db, flt=EmployeeFilter(
+         "Должность7", datetime.date(2005, 1, 1), datetime.date(2015, 12, 31))),
+     ("ix_employees_position_hire_date",)),
+    ("число строк под фильтром должности",
+     lambda db: count_employees(db, flt=EmployeeFilter("Должность7")),
+     ("ix_employees_position_hire_date", "ix_employees_position")),
+    ("список должностей",
+     list_positions,
+     ("ix_employees_position", "ix_employees_position_hire_date")),
+]
+
+def capture(engine, fn, db):
+    """Выполняет fn(db) и возвращает выполненные им SELECT (SQL и параметры)."""
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        fn(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return statements
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("-v", "--verbose", action="store_true", help="печатать планы")
+    args = parser.parse_args()
+
+    failed = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = make_engine(f"sqlite:///{os.path.join(workdir, 'explain.db')}")
+        init_db(engine)
+        seed(engine, args.rows)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        with Session() as db:
+            for title, fn, indexes in CHECKS:
+                # Главный запрос — первый SELECT (следом может идти подсчёт total)
+                statement, parameters = capture(engine, fn, db)[0]
+                with engine.connect() as conn:
+                    plan = [row[-1] for row in conn.exec_driver_sql(
+                        "EXPLAIN QUERY PLAN " + statement, parameters)]
+                ok = any(index in line for line in plan for index in indexes)
+                failed += not ok
+                print(f"{'OK ' if ok else 'FAIL'} {title}")
+                if args.verbose or not ok:
+                    for line in plan:
+                        print(f"       {line}")
+        engine.dispose()
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
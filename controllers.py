@@ -1,13 +1,16 @@
 # controllers.py
 
 import logging
-from typing import Optional, List
+from datetime import date
+from typing import Optional, List, NamedTuple, Iterator, Set, Tuple, Union
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import or_, func
+from sqlalchemy import or_, func, select, case, String, tuple_, update, delete
 
-from models import Employee, User
+from models import Document, Employee, User
+from search_index import search_mode, match_subquery
 from auth import register_user, authenticate
+from events import bus, EmployeeEvent, EMPLOYEE_CREATED, EMPLOYEE_UPDATED, EMPLOYEE_DELETED, EMPLOYEES_RELOAD
 from ui.utils import notify_qt
 
 logger = logging.getLogger(__name__)
@@ -24,6 +27,7 @@ def create_employee(db: Session, username: str, password: str, **data) -> Employ
         db.refresh(emp)
         logger.info(f"Создан сотрудник: {emp.id} — {emp.first_name} {emp.last_name}")
         notify_qt("HR", f"Создан сотрудник {emp.first_name} {emp.last_name}")
+        bus.publish(EmployeeEvent(EMPLOYEE_CREATED, emp.id, dict(data, username=username)))
         return emp
     except SQLAlchemyError as e:
         db.rollback()
@@ -52,33 +56,309 @@ def get_employee_by_user(db: Session, user_id: int) -> Optional[Employee]:
         .first()
     )
 
+# Размер страницы по умолчанию для постраничной выборки
+DEFAULT_PAGE_SIZE = 200
+
+class EmployeePage(NamedTuple):
+    """
+    Страница сотрудников для keyset-пагинации:
+    - items — сотрудники страницы (по возрастанию ID или в порядке EmployeeSort):
+      объекты Employee или лёгкие строки EMPLOYEE_ROW_COLUMNS (list_employee_rows_page),
+    - next_cursor — ID последнего сотрудника, а при сортировке — пара
+      (значение поля, ID); None, если страниц больше нет,
+    - total_estimate — оценка общего числа строк (считается только для первой страницы).
+    """
+    items: list
+    next_cursor: Optional[Union[int, Tuple]]
+    total_estimate: Optional[int]
+
+class EmployeeSort(NamedTuple):
+    """
+    Порядок постраничной выборки: field — ключ SORT_FIELDS,
+    descending — по убыванию. При равных значениях порядок задаёт ID
+    (в том же направлении); NULL, как принято в SQLite, меньше любого значения.
+    """
+    field: str
+    descending: bool = False
+
+class EmployeeFilter(NamedTuple):
+    """
+    Фильтры таблицы сотрудников:
+    - position — должность (точное совпадение),
+    - hired_from / hired_to — диапазон даты приёма (включительно),
+    - min_vacation_days — не меньше стольких дней отпуска.
+    Пустое значение — фильтр не применяется. Должность с диапазоном дат
+    выбираются по индексу ix_employees_position_hire_date.
+    """
+    position: str = ""
+    hired_from: Optional[date] = None
+    hired_to: Optional[date] = None
+    min_vacation_days: Optional[int] = None
+
+NO_FILTER = EmployeeFilter()
+
+# Поля, по которым таблицу можно сортировать в SQL. У каждого есть индекс
+# (models.Employee, users.username), поэтому ORDER BY поле, id с LIMIT
+# читает индекс по порядку, не сортируя всю выборку
+SORT_FIELDS = {
+    "id": Employee.id,
+    "username": User.username,
+    "last_name": Employee.last_name,
+    "position": Employee.position,
+    "hire_date": Employee.hire_date,
+    "vacation_days_left": Employee.vacation_days_left,
+}
+
+# Колонки лёгкой выборки для таблицы и отчётов: один запрос с JOIN,
+# без ORM-объектов и без хэша пароля
+EMPLOYEE_ROW_COLUMNS = (
+    Employee.id,
+    User.username,
+    Employee.first_name,
+    Employee.last_name,
+    Employee.position,
+    Employee.hire_date,
+    Employee.vacation_days_left,
+)
+
+def _filter_employees(query, search: str, matches=None, user_joined: bool = False):
+    """
+    Накладывает на запрос фильтр поиска.
+    Если search — число, фильтрует по точному ID;
+    иначе — по FTS-индексу (matches — подзапрос match_subquery),
+    а без него — по логину, имени или фамилии через casefold() + LIKE.
+    user_joined — в запросе уже есть JOIN с users.
+    """
+    if not search:
+        return query
+    if search.isdigit():
+        return query.filter(Employee.id == int(search))
+    if matches is not None:
+        return query.filter(Employee.id.in_(select(matches.c.emp_id)))
+    pattern = f"%{search.casefold()}%"
+    if not user_joined:
+        query = query.join(User, Employee.user_id == User.id)
+    return (
+        query.filter(
+                 or_(
+                     func.casefold(User.username).like(pattern),
+                     func.casefold(Employee.first_name).like(pattern),
+                     func.casefold(Employee.last_name).like(pattern),
+                 )
+             )
+    )
+
+def _apply_filter(query, flt: Optional[EmployeeFilter]):
+    """Накладывает на запрос фильтры EmployeeFilter."""
+    if flt is None or flt == NO_FILTER:
+        return query
+    if flt.position:
+        query = query.filter(Employee.position == flt.position)
+    if flt.hired_from is not None:
+        query = query.filter(Employee.hire_date >= flt.hired_from)
+    if flt.hired_to is not None:
+        query = query.filter(Employee.hire_date <= flt.hired_to)
+    if flt.min_vacation_days is not None:
+        query = query.filter(Employee.vacation_days_left >= flt.min_vacation_days)
+    return query
+
+def _search_matches(db: Session, search: str):
+    """FTS-подзапрос для строки поиска или None (ID, пустой поиск, нет FTS5)."""
+    if not search or search.isdigit():
+        return None
+    return match_subquery(search, search_mode(db.get_bind()))
+
 def list_employees(db: Session, search: str = "") -> List[Employee]:
     """
     Возвращает список сотрудников с предзагрузкой User.
     Если search — число, фильтрует по точному ID;
-    иначе — по логину, имени или фамилии (ilike).
+    иначе — по логину, имени или фамилии, упорядочивая
+    по релевантности, если доступен FTS-индекс.
     """
     query = db.query(Employee).options(selectinload(Employee.user))
+    matches = _search_matches(db, search)
+    if matches is not None:
+        query = (
+            query.join(matches, matches.c.emp_id == Employee.id)
+                 .order_by(matches.c.rank, Employee.id)
+        )
+    else:
+        query = _filter_employees(query, search).order_by(Employee.id)
+    emps = query.all()
+    logger.info(f"Найдено сотрудников: {len(emps)} (search='{search}')")
+    return emps
+
+def count_employees(db: Session, search: str = "", flt: Optional[EmployeeFilter] = None) -> int:
+    """
+    Возвращает число сотрудников под фильтром (без загрузки ORM-объектов).
+    """
+    query = _filter_employees(db.query(func.count(Employee.id)), search, _search_matches(db, search))
+    return _apply_filter(query, flt).scalar() or 0
+
+def list_positions(db: Session) -> List[str]:
+    """Все должности по алфавиту — для фильтра таблицы (читается только индекс)."""
+    return [p for (p,) in db.query(Employee.position).distinct().order_by(Employee.position)]
+
+def list_employees_page(
+    db: Session,
+    search: str = "",
+    after_id: Optional[int] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> EmployeePage:
+    """
+    Возвращает одну страницу сотрудников с предзагрузкой User.
+    Курсор — ID последнего сотрудника предыдущей страницы (after_id):
+    выборка идёт по индексу первичного ключа без OFFSET,
+    поэтому стоимость страницы не зависит от её номера.
+    """
+    query = _filter_employees(
+        db.query(Employee).options(selectinload(Employee.user)),
+        search,
+        _search_matches(db, search),
+    )
+    return _page(db, query, search, after_id, page_size)
+
+def list_employee_rows_page(
+    db: Session,
+    search: str = "",
+    after_id: Optional[Union[int, Tuple]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sort: Optional[EmployeeSort] = None,
+    flt: Optional[EmployeeFilter] = None,
+) -> EmployeePage:
+    """
+    То же, что list_employees_page, но items — строки с колонками
+    EMPLOYEE_ROW_COLUMNS (id, username, first_name, last_name, position,
+    hire_date, vacation_days_left), выбранные одним запросом с JOIN.
+    sort — порядок строк; курсор after_id тогда — next_cursor
+    предыдущей страницы того же порядка. flt — фильтры EmployeeFilter.
+    """
+    query = _filter_employees(
+        db.query(*EMPLOYEE_ROW_COLUMNS).join(User, Employee.user_id == User.id),
+        search,
+        _search_matches(db, search),
+        user_joined=True,
+    )
+    return _page(db, _apply_filter(query, flt), search, after_id, page_size, sort, flt)
+
+def get_employee_row(db: Session, emp_id: int, search: str = ""):
+    """
+    Лёгкая строка EMPLOYEE_ROW_COLUMNS для одного сотрудника или None,
+    если его нет или он не проходит фильтр search — чтобы обновить
+    одну строку таблицы после правки.
+    """
+    query = _filter_employees(
+        db.query(*EMPLOYEE_ROW_COLUMNS).join(User, Employee.user_id == User.id),
+        search,
+        _search_matches(db, search),
+        user_joined=True,
+    )
+    return query.filter(Employee.id == emp_id).first()
+
+def _after_sorted(query, sort: EmployeeSort, cursor: Tuple):
+    """
+    Условие «после курсора (значение, ID)» для порядка sort.
+    NULL меньше любого значения: при возрастании NULL-строки идут первыми,
+    при убывании — последними.
+    """
+    column = SORT_FIELDS[sort.field]
+    value, emp_id = cursor
+    if value is None:
+        if sort.descending:
+            return query.filter(column.is_(None), Employee.id < emp_id)
+        return query.filter(or_(column.isnot(None), Employee.id > emp_id))
+    if sort.descending:
+        return query.filter(or_(tuple_(column, Employee.id) < (value, emp_id), column.is_(None)))
+    return query.filter(tuple_(column, Employee.id) > (value, emp_id))
 
-    if search:
-        if search.isdigit():
-            query = query.filter(Employee.id == int(search))
+def _page(
+    db: Session,
+    query,
+    search: str,
+    after_id,
+    page_size: int,
+    sort: Optional[EmployeeSort] = None,
+    flt: Optional[EmployeeFilter] = None,
+) -> EmployeePage:
+    """
+    Keyset-страница для уже отфильтрованного запроса: по Employee.id,
+    а при sort — по паре (поле, Employee.id).
+    """
+    if sort is None or sort.field == "id":
+        descending = sort is not None and sort.descending
+        if after_id is not None:
+            after_id = after_id[1] if isinstance(after_id, tuple) else after_id
+            query = query.filter(Employee.id < after_id if descending else Employee.id > after_id)
+        query = query.order_by(Employee.id.desc() if descending else Employee.id)
+    else:
+        column = SORT_FIELDS[sort.field]
+        if after_id is not None:
+            query = _after_sorted(query, sort, after_id)
+        if sort.descending:
+            query = query.order_by(column.desc(), Employee.id.desc())
         else:
-            pattern = f"%{search}%"
-            query = (
-                query.join(User)
-                     .filter(
-                         or_(
-                             func.lower(User.username).like(func.lower(pattern)),
-                             func.lower(Employee.first_name).like(func.lower(pattern)),
-                             func.lower(Employee.last_name).like(func.lower(pattern)),
-                         )
-                     )
-            )
+            query = query.order_by(column, Employee.id)
+    # Берём на одну строку больше, чтобы понять, есть ли следующая страница
+    items = query.limit(page_size + 1).all()
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = last.id if sort is None else (getattr(last, sort.field), last.id)
+    total = count_employees(db, search, flt) if after_id is None else None
+    logger.info(
+        f"Страница сотрудников: {len(items)} (search='{search}', after_id={after_id}, total≈{total})"
+    )
+    return EmployeePage(items, next_cursor, total)
 
-    emps = query.order_by(Employee.id).all()
-    logger.info(f"Найдено сотрудников: {len(emps)} (search='{search}')")
-    return emps
+def _iter_pages(list_page, db: Session, search: str, page_size: int, **options):
+    after_id = None
+    while True:
+        page = list_page(db, search, after_id, page_size, **options)
+        yield from page.items
+        if page.next_cursor is None:
+            return
+        after_id = page.next_cursor
+
+def iter_employees(db: Session, search: str = "", page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Employee]:
+    """
+    Потоково перебирает сотрудников под фильтром (по возрастанию ID),
+    загружая их страницами — для отчётов по всему штату.
+    """
+    return _iter_pages(list_employees_page, db, search, page_size)
+
+def iter_employee_rows(
+    db: Session,
+    search: str = "",
+    page_size: int = DEFAULT_PAGE_SIZE,
+    flt: Optional[EmployeeFilter] = None,
+):
+    """
+    Как iter_employees, но отдаёт лёгкие строки EMPLOYEE_ROW_COLUMNS —
+    этого достаточно для отчётов PDF/XLSX. flt — фильтры EmployeeFilter.
+    """
+    return _iter_pages(list_employee_rows_page, db, search, page_size, flt=flt)
+
+def employee_column_widths(
+    db: Session, search: str = "", flt: Optional[EmployeeFilter] = None
+) -> List[int]:
+    """
+    Длины самых длинных значений колонок отчёта (ID, ФИО, Должность,
+    Дата приёма, Отпуск) под фильтром — одним агрегирующим запросом,
+    чтобы потоковый экспорт знал ширины колонок до записи строк.
+    """
+    full_name = Employee.first_name + " " + Employee.last_name
+    query = db.query(
+        func.max(func.length(func.cast(Employee.id, String))),
+        func.max(func.length(full_name)),
+        func.max(func.length(Employee.position)),
+        func.max(case((Employee.hire_date.isnot(None), 10), else_=0)),
+        func.max(func.length(func.cast(Employee.vacation_days_left, String))),
+    ).select_from(Employee)
+    query = _filter_employees(query, search, _search_matches(db, search))
+    row = _apply_filter(query, flt).one()
+    return [value or 0 for value in row]
 
 def update_employee(db: Session, emp_id: int, **data) -> None:
     """
@@ -87,12 +367,16 @@ def update_employee(db: Session, emp_id: int, **data) -> None:
     emp = get_employee(db, emp_id)
     if not emp:
         raise ValueError(f"Employee with id={emp_id} not found")
-    for k, v in data.items():
+    # В событие попадают только действительно изменённые поля
+    changed = {k: v for k, v in data.items() if getattr(emp, k) != v}
+    for k, v in changed.items():
         setattr(emp, k, v)
     try:
         db.commit()
         logger.info(f"Обновлён сотрудник: {emp.id}")
         notify_qt("HR", f"Обновлён сотрудник {emp.first_name} {emp.last_name}")
+        if changed:
+            bus.publish(EmployeeEvent(EMPLOYEE_UPDATED, emp_id, changed))
     except SQLAlchemyError as e:
         db.rollback()
         logger.error(f"Ошибка при обновлении сотрудника: {e}")
@@ -110,9 +394,124 @@ def delete_employee(db: Session, emp_id: int) -> None:
         # удаляем User, каскад удалит Employee
         db.delete(emp.user)
         db.commit()
-        logger.info(f"Удалён сотрудник: {emp.id}")
+        logger.info(f"Удалён сотрудник: {emp_id}")
         notify_qt("HR", f"Удалён сотрудник {name}")
+        bus.publish(EmployeeEvent(EMPLOYEE_DELETED, emp_id, {}))
     except SQLAlchemyError as e:
         db.rollback()
         logger.error(f"Ошибка при удалении сотрудника: {e}")
         raise
+
+# Пакетные операции: ID в одном IN не больше этого (лимит параметров SQLite — 32766)
+BATCH_CHUNK_SIZE = 10000
+# До стольких сотрудников пакетная операция публикует события по каждому,
+# больше — одно EMPLOYEES_RELOAD (дешевле перечитать список целиком)
+BATCH_EVENT_LIMIT = 50
+
+# Поля, которые можно менять пакетно (не ключи и не связи)
+BATCH_UPDATE_FIELDS = {
+    column.key for column in Employee.__table__.columns
+} - {"id", "user_id"}
+
+def _id_chunks(ids: List[int]) -> Iterator[List[int]]:
+    for start in range(0, len(ids), BATCH_CHUNK_SIZE):
+        yield ids[start:start + BATCH_CHUNK_SIZE]
+
+def _publish_batch(kind: str, ids: List[int], fields: dict):
+    if len(ids) > BATCH_EVENT_LIMIT:
+        bus.publish(EmployeeEvent(EMPLOYEES_RELOAD, None, {kind: len(ids)}))
+        return
+    for emp_id in ids:
+        bus.publish(EmployeeEvent(kind, emp_id, dict(fields)))
+
+def update_employees(db: Session, ids, **fields) -> int:
+    """
+    Присваивает fields всем сотрудникам ids одним UPDATE … WHERE id IN (…)
+    (по BATCH_CHUNK_SIZE ID) в одной транзакции, без загрузки ORM-объектов.
+    Возвращает число изменённых строк.
+    """
+    unknown = set(fields) - BATCH_UPDATE_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown employee fields: {', '.join(sorted(unknown))}")
+    ids = sorted(set(ids))
+    if not ids or not fields:
+        return 0
+    try:
+        updated = 0
+        for chunk in _id_chunks(ids):
+            result = db.execute(
+                update(Employee)
+                .where(Employee.id.in_(chunk))
+                .values(**fields)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Ошибка при пакетном обновлении сотрудников: {e}")
+        raise
+    # UPDATE мимо ORM: загруженные в сессию объекты устарели
+    db.expire_all()
+    logger.info(f"Обновлено сотрудников: {updated} (поля: {', '.join(fields)})")
+    notify_qt("HR", f"Обновлено сотрудников: {updated}")
+    _publish_batch(EMPLOYEE_UPDATED, ids, fields)
+    return updated
+
+class BatchDelete(NamedTuple):
+    """
+    Результат delete_employees: ID действительно удалённых сотрудников
+    и SHA-256 их документов — по ним вызывающий удаляет фото, документы
+    и освободившиеся блобы хранилища (DocumentStore.remove_employees).
+    """
+    ids: List[int]
+    digests: Set[str]
+
+def delete_employees(db: Session, ids) -> BatchDelete:
+    """
+    Удаляет сотрудников ids вместе с их пользователями и строками documents —
+    по одному DELETE на таблицу (по BATCH_CHUNK_SIZE ID) в одной транзакции.
+    Каскад, который для одного сотрудника выполняет ORM (User → Employee →
+    Document), здесь выписан явно.
+    """
+    ids = sorted(set(ids))
+    if not ids:
+        return BatchDelete([], set())
+    try:
+        deleted = []
+        digests = set()
+        for chunk in _id_chunks(ids):
+            rows = db.execute(
+                select(Employee.id, Employee.user_id).where(Employee.id.in_(chunk))
+            ).all()
+            if not rows:
+                continue
+            emp_ids = [emp_id for emp_id, _ in rows]
+            user_ids = [user_id for _, user_id in rows]
+            digests.update(db.scalars(
+                select(Document.sha256).where(Document.employee_id.in_(emp_ids)).distinct()
+            ))
+            db.execute(
+                delete(Document).where(Document.employee_id.in_(emp_ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.execute(
+                delete(Employee).where(Employee.id.in_(emp_ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.execute(
+                delete(User).where(User.id.in_(user_ids))
+                .execution_options(synchronize_session=False)
+            )
+            deleted.extend(emp_ids)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Ошибка при пакетном удалении сотрудников: {e}")
+        raise
+    # Объекты удалённых строк, если сессия их загружала, больше не действительны
+    db.expire_all()
+    logger.info(f"Удалено сотрудников: {len(deleted)}")
+    notify_qt("HR", f"Удалено сотрудников: {len(deleted)}")
+    _publish_batch(EMPLOYEE_DELETED, deleted, {})
+    return BatchDelete(deleted, digests)
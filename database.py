@@ -1,17 +1,72 @@
 # database.py
 
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 # URL для SQLite (файл hr.db находится в корне проекта)
 SQLALCHEMY_DATABASE_URL = "sqlite:///hr.db"
 
-# Создаём движок с отключённым check_same_thread, чтобы можно было работать из разных потоков
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+# Профили настройки SQLite (PRAGMA применяются к каждому новому соединению).
+# Профиль выбирается переменной окружения HR_DB_PROFILE, например:
+#     HR_DB_PROFILE=production python main.py
+# - default    — настройки SQLite по умолчанию (журнал отката);
+# - production — WAL, synchronous=NORMAL, mmap и увеличенный кэш страниц:
+#                чтение не блокирует запись, коммит без fsync журнала.
+#                WAL требует общей памяти, поэтому все рабочие места должны
+#                открывать hr.db на одной машине (не через сетевую папку);
+# - network    — для hr.db в сетевой папке: обычный журнал, но с ожиданием
+#                снятия блокировки и увеличенным кэшем.
+ENGINE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,   # байт
+        "cache_size": -64000,             # отрицательное значение — в КиБ (~64 МБ)
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,             # мс
+    },
+    "network": {
+        "journal_mode": "DELETE",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 15000,
+    },
+}
+
+DB_PROFILE = os.environ.get("HR_DB_PROFILE", "default")
+
+def _casefold(value):
+    """Свёртка регистра по Unicode: встроенный lower() SQLite понимает только ASCII."""
+    return value.casefold() if isinstance(value, str) else value
+
+def make_engine(url: str = SQLALCHEMY_DATABASE_URL, profile: str = DB_PROFILE):
+    """
+    Создаёт движок SQLite с указанным профилем PRAGMA.
+    check_same_thread отключён, чтобы можно было работать из разных потоков.
+    """
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(
+            f"Неизвестный профиль БД '{profile}', доступны: {', '.join(ENGINE_PROFILES)}"
+        )
+    pragmas = ENGINE_PROFILES[profile]
+    eng = create_engine(url, connect_args={"check_same_thread": False})
+
+    @event.listens_for(eng, "connect")
+    def _on_connect(dbapi_conn, connection_record):
+        # SQL-функция casefold() для поиска без FTS5 (в т.ч. по кириллице)
+        dbapi_conn.create_function("casefold", 1, _casefold, deterministic=True)
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+    return eng
+
+# Движок приложения
+engine = make_engine()
 
 # Фабрика сессий
 SessionLocal = sessionmaker(
@@ -23,10 +78,17 @@ SessionLocal = sessionmaker(
 # Базовый класс для всех моделей
 Base = declarative_base()
 
-def init_db():
+def init_db(bind=None):
     """
-    Инициализирует базу данных — создаёт все таблицы, описанные в моделях.
+    Инициализирует базу данных — создаёт все таблицы, описанные в моделях,
+    и применяет миграции схемы.
     Вызывать при запуске приложения (например, в main.py).
     """
     import models  # noqa: F401
-    Base.metadata.create_all(bind=engine)
+    from migrations import migrate
+    from search_index import ensure_search_index
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    # create_all не меняет существующие таблицы — новое в схеме догоняют миграции
+    migrate(bind)
+    ensure_search_index(bind)
@@ -0,0 +1,136 @@
+# events.py
+
+import logging
+import threading
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Виды событий о сотрудниках
+EMPLOYEE_CREATED = "created"
+EMPLOYEE_UPDATED = "updated"
+EMPLOYEE_DELETED = "deleted"
+# Изменилось много строк сразу (импорт, пакетные операции, другой процесс) —
+# списки нужно перечитать целиком
+EMPLOYEES_RELOAD = "reload"
+
+class EmployeeEvent(NamedTuple):
+    """
+    Событие об изменении сотрудника:
+    - kind — EMPLOYEE_CREATED / EMPLOYEE_UPDATED / EMPLOYEE_DELETED / EMPLOYEES_RELOAD,
+    - emp_id — ID сотрудника (None для EMPLOYEES_RELOAD),
+    - fields — изменённые поля и их новые значения.
+    """
+    kind: str
+    emp_id: Optional[int]
+    fields: dict
+
+class EventBus:
+    """
+    Внутрипроцессная шина событий: контроллеры публикуют события
+    после коммита, открытые представления подписываются и обновляются
+    на месте. Подписчики вызываются в потоке публикации — виджетам
+    нужен ui.event_bridge, который переносит события в GUI-поток.
+    """
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[EmployeeEvent], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event: EmployeeEvent):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Ошибка обработчика события {event.kind}: {e}")
+
+# Шина приложения
+bus = EventBus()
+
+# Операторы, меняющие данные или схему (для DataVersionWatcher)
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+_WROTE = "data_version_wrote"
+
+class DataVersionWatcher:
+    """
+    Межпроцессные изменения: PRAGMA data_version на отдельном соединении
+    меняется, когда hr.db коммитит любое другое соединение (в том числе
+    другое рабочее место). Коммиты через engine этого процесса, в которых
+    была запись (WRITE_PREFIXES), считаются; если за это время их не было,
+    изменение чужое — публикуется EMPLOYEES_RELOAD. Свои записи сами публикуют нужные события (или
+    не касаются списков, как документы и пароли).
+    poll() нужно вызывать периодически (см. ui.event_bridge). Чужой коммит,
+    попавший в один интервал опроса с собственным, не отличить
+    от своего — такие изменения подхватит следующее обновление списка.
+    """
+    def __init__(self, engine, event_bus: EventBus = bus):
+        self.bus = event_bus
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._commits = 0
+        self._seen = 0
+        # Событие commit приходит до записи в БД: к моменту, когда своё
+        # изменение сдвинет data_version, счётчик уже увеличен
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+        event.listen(engine, "rollback", self._on_rollback)
+        self._conn = engine.raw_connection()
+        self._version = self._read()
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Коммит без записи data_version не меняет — такие не считаются,
+        # иначе следующий чужой коммит сошёл бы за свой
+        if statement.lstrip()[:7].upper().startswith(WRITE_PREFIXES):
+            conn.info[_WROTE] = True
+
+    def _on_commit(self, conn):
+        if conn.info.pop(_WROTE, False):
+            with self._lock:
+                self._commits += 1
+
+    def _on_rollback(self, conn):
+        conn.info.pop(_WROTE, None)
+
+    def _read(self) -> int:
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute("PRAGMA data_version")
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def poll(self) -> bool:
+        """Проверить версию данных; True, если опубликовано EMPLOYEES_RELOAD."""
+        # Сначала версия, потом счётчик: свой коммит, сдвинувший версию, уже посчитан
+        version = self._read()
+        with self._lock:
+            commits = self._commits
+        if version == self._version:
+            return False
+        self._version = version
+        if commits != self._seen:
+            # Изменение объясняется собственными коммитами
+            self._seen = commits
+            return False
+        logger.info("Данные изменены другим процессом")
+        self.bus.publish(EmployeeEvent(EMPLOYEES_RELOAD, None, {}))
+        return True
+
+    def close(self):
+        event.remove(self._engine, "before_cursor_execute", self._on_execute)
+        event.remove(self._engine, "commit", self._on_commit)
+        event.remove(self._engine, "rollback", self._on_rollback)
+        self._conn.close()
@@ -1,21 +1,29 @@
 # main.py
 
+import os
 import sys
+import time
 import logging
 from PyQt5.QtWidgets import (
     QApplication, QStackedWidget, QSystemTrayIcon, QStyle, QDesktopWidget
 )
-from PyQt5.QtCore import QLocale, QSize, QRect
+from PyQt5.QtCore import QLocale, QSize, QRect, QTimer, QThreadPool
 from qt_material import apply_stylesheet
 
-from database import init_db, SessionLocal
-from auth import register_user
+from database import init_db, SessionLocal, engine
+from auth import ensure_user
 import ui.utils as utils
+from ui.event_bridge import employee_events
 from ui.login_widget import LoginWidget
-from ui.hr_dashboard_widget import HRDashboardWidget
-from ui.employee_profile_widget import EmployeeProfileWidget
+from ui.workers import Worker
+# Окна после входа (панель HR, карточка сотрудника) и всё, что они тянут,
+# импортируются в on_login — окно входа появляется раньше
+
 # Единый формат даты для всего UI
 DATE_FORMAT = "dd.MM.yyyy"
+# Если переменная задана, приложение закрывается сразу после показа окна входа
+# и пишет в лог время запуска (см. bench/bench_startup.py)
+STARTUP_PROBE_ENV = "HR_STARTUP_PROBE"
 def configure_logging():
     logging.basicConfig(
         level=logging.INFO,
@@ -23,9 +31,18 @@ def configure_logging():
         handlers=[
             logging.FileHandler("app.log", encoding="utf-8"),
             logging.StreamHandler()
-        ]
+        ],
+        # qt_material при импорте пишет предупреждение через root-логгер
+        # и тем самым уже настраивает его — перенастраиваем принудительно
+        force=True
     )
 
+def reconcile_document_index():
+    """Сверка индекса документов с папками сотрудников (в фоновом потоке)."""
+    from services.document_service import reconcile_documents
+    with SessionLocal() as db:
+        return reconcile_documents(db)
+
 def center_widget(widget):
     """Центрирует widget на экране."""
     screen = QApplication.primaryScreen().availableGeometry()
@@ -34,16 +51,17 @@ def center_widget(widget):
     widget.move(fg.topLeft())
 
 def main():
+    started = time.perf_counter()
     configure_logging()
     logging.info("Запуск приложения")
     # Инициализируем БД
     init_db()
-    # Seed HR-пользователя
+    # Seed HR-пользователя (bcrypt — только если его ещё нет)
     try:
         with SessionLocal() as db:
-            register_user(db, username="da", password="da", role="hr")
-    except Exception:
-        pass
+            ensure_user(db, username="da", password="da", role="hr")
+    except Exception as e:
+        logging.error(f"Не удалось создать пользователя da: {e}")
 
     app = QApplication(sys.argv)
     # Устанавливаем русскую локаль по-умолчанию (даты, числа и т.п.)
@@ -53,6 +71,8 @@ def main():
     tray = QSystemTrayIcon(app.style().standardIcon(QStyle.SP_ComputerIcon))
     tray.show()
     utils._tray = tray
+    # Изменения БД из других процессов приходят в окна как события
+    employee_events().watch_database(engine)
     # Стек виджетов
     stack = QStackedWidget()
 
@@ -69,12 +89,25 @@ def main():
 
     # Сохраняем начальную геометрию (необязательно)
     initial_geom = stack.geometry()
+    logging.info(f"Окно входа показано через {time.perf_counter() - started:.3f} с")
+    if os.environ.get(STARTUP_PROBE_ENV):
+        QTimer.singleShot(0, app.quit)
+    else:
+        # Документы, скопированные в папки вручную или до появления индекса
+        docs_job = Worker("documents", reconcile_document_index)
+        QThreadPool.globalInstance().start(docs_job)
 
     def logout():
         logging.info("Выход из аккаунта")
         login.le_user.clear()
         login.le_pwd.clear()
+        session_widget = stack.currentWidget()
         stack.setCurrentWidget(login)
+        if session_widget is not login:
+            # Окно сеанса удаляется: иначе оно остаётся подписанным на события
+            # сотрудников и обновляется вместе с окнами следующих входов
+            stack.removeWidget(session_widget)
+            session_widget.deleteLater()
         # фиксируем снова 320×200 и центрируем
         stack.setFixedSize(login.size())
         stack.showNormal()
@@ -88,8 +121,10 @@ def main():
 
         # выбираем виджет
         if user.role == "hr":
+            from ui.hr_dashboard_widget import HRDashboardWidget
             w = HRDashboardWidget(user, on_logout=logout)
         else:
+            from ui.employee_profile_widget import EmployeeProfileWidget
             w = EmployeeProfileWidget(user, on_logout=logout)
 
         stack.addWidget(w)
@@ -100,6 +135,10 @@ def main():
         stack.showNormal()      # чтобы убрать maximized
         center_widget(stack)
 
+    # Эффект кэша чтений EmployeeService — в лог при выходе
+    from services.employee_cache import log_shared_stats
+    app.aboutToQuit.connect(log_shared_stats)
+
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
@@ -0,0 +1,207 @@
+# migrations.py
+"""
+Версионные миграции схемы hr.db.
+
+Base.metadata.create_all создаёт только отсутствующие таблицы и не меняет
+существующие, поэтому всё, что появляется в схеме после первого выпуска
+(индексы, колонки), описывается здесь. Номер последней применённой
+миграции хранится в заголовке файла БД — PRAGMA user_version.
+
+Шаги миграций идемпотентны (IF NOT EXISTS, проверка колонки перед
+ADD COLUMN), поэтому на новой БД, где create_all уже создал всё по моделям,
+они лишь проставляют номер версии. Где возможно, схема меняется на месте:
+ALTER TABLE ADD COLUMN правит только описание таблицы, CREATE INDEX читает
+таблицу один раз. Полная пересборка (rebuild_table) нужна лишь для того,
+что SQLite не умеет менять через ALTER TABLE (тип, NOT NULL без DEFAULT,
+UNIQUE, удаление ограничений).
+
+Запуск из корня проекта (отчёт о версиях и времени шагов):
+    python migrations.py [--db hr.db] [--status]
+"""
+
+import argparse
+import logging
+import re
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Шаг миграции: SQL-оператор или функция step(conn) для соединения SQLAlchemy
+Step = Union[str, Callable]
+
+class Migration(NamedTuple):
+    """Миграция: номер версии схемы, описание и шаги."""
+    version: int
+    description: str
+    steps: Tuple[Step, ...]
+
+class MigrationResult(NamedTuple):
+    """Применённая миграция и время её выполнения, с."""
+    version: int
+    description: str
+    seconds: float
+
+def create_index(name: str, table: str, *columns: str, unique: bool = False) -> str:
+    """Шаг: CREATE INDEX IF NOT EXISTS."""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    return f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+
+def _columns(conn, table: str) -> List[str]:
+    return [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")]
+
+def add_column(table: str, name: str, ddl: str) -> Callable:
+    """
+    Шаг: ALTER TABLE table ADD COLUMN name ddl, если колонки ещё нет.
+    Работает за O(1) независимо от числа строк. Ограничения SQLite:
+    нельзя PRIMARY KEY/UNIQUE, NOT NULL — только с DEFAULT,
+    DEFAULT — только константа.
+    """
+    def step(conn):
+        if name not in _columns(conn, table):
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+    step.__doc__ = f"ADD COLUMN {table}.{name}"
+    return step
+
+def rebuild_table(table: str, create_sql: str, select_sql: Optional[str] = None) -> Callable:
+    """
+    Шаг: пересборка таблицы по процедуре из документации SQLite
+    («Making Other Kinds Of Table Schema Changes»): новая таблица
+    create_sql (вместо имени — {table}), перенос строк одним INSERT … SELECT,
+    удаление старой, переименование, восстановление индексов и триггеров.
+    select_sql — выборка строк для новой таблицы (по умолчанию — общие колонки).
+    Триггеры других таблиц, ссылающиеся на table (например, FTS-триггер users),
+    на время пересборки снимаются: иначе SQLite не даст переименовать таблицу.
+    Выполняется внутри общей транзакции migrate, так что при ошибке
+    старая таблица остаётся нетронутой.
+    """
+    def step(conn):
+        new_table = f"{table}_new"
+        reference = re.compile(rf"\b{re.escape(table)}\b", re.IGNORECASE)
+        indexes = [
+            sql for (sql,) in conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            )
+        ]
+        triggers = [
+            (name, sql) for name, tbl_name, sql in conn.exec_driver_sql(
+                "SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'trigger'"
+            )
+            if tbl_name == table or reference.search(sql)
+        ]
+        for name, _ in triggers:
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {new_table}")
+        conn.exec_driver_sql(create_sql.format(table=new_table))
+        source = select_sql
+        if source is None:
+            common = [c for c in _columns(conn, new_table) if c in set(_columns(conn, table))]
+            source = f"SELECT {', '.join(common)} FROM {table}"
+            target = f"{new_table} ({', '.join(common)})"
+        else:
+            target = new_table
+        conn.exec_driver_sql(f"INSERT INTO {target} {source.format(table=table)}")
+        conn.exec_driver_sql(f"DROP TABLE {table}")
+        conn.exec_driver_sql(f"ALTER TABLE {new_table} RENAME TO {table}")
+        # Индексы и триггеры удалены вместе со старой таблицей
+        for sql in indexes:
+            conn.exec_driver_sql(sql)
+        for _, sql in triggers:
+            conn.exec_driver_sql(sql)
+    step.__doc__ = f"REBUILD {table}"
+    return step
+
+# Миграции по возрастанию версии; новые — только в конец списка
+MIGRATIONS = (
+    Migration(1, "индексы колонок сортировки таблицы", (
+        create_index("ix_employees_last_name", "employees", "last_name"),
+        create_index("ix_employees_position", "employees", "position"),
+        create_index("ix_employees_hire_date", "employees", "hire_date"),
+        create_index("ix_employees_vacation_days_left", "employees", "vacation_days_left"),
+    )),
+    Migration(2, "составной индекс (position, hire_date) для фильтров таблицы", (
+        create_index("ix_employees_position_hire_date", "employees", "position", "hire_date"),
+        # Планировщику нужна статистика, чтобы выбирать между индексами
+        "ANALYZE employees",
+    )),
+    Migration(3, "год последнего начисления отпуска", (
+        add_column("employees", "vacation_accrued_year", "INTEGER"),
+    )),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+def schema_version(conn) -> int:
+    """Текущая версия схемы (PRAGMA user_version) для соединения SQLAlchemy."""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+def _run_step(conn, step: Step):
+    if callable(step):
+        step(conn)
+    else:
+        conn.exec_driver_sql(step)
+
+def migrate(engine, migrations: Sequence[Migration] = MIGRATIONS) -> List[MigrationResult]:
+    """
+    Применяет недостающие миграции одной транзакцией и возвращает
+    их список со временем выполнения. Если упал любой шаг, откатываются
+    все миграции запуска, и версия схемы не меняется.
+    BEGIN IMMEDIATE сразу берёт блокировку записи: если два рабочих места
+    запускаются одновременно, второе дождётся первого и увидит новую версию.
+    """
+    latest = migrations[-1].version if migrations else 0
+    with engine.connect() as conn:
+        if schema_version(conn) >= latest:
+            return []
+    results = []
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        # pysqlite не открывает транзакцию перед DDL — открываем явно
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        current = schema_version(conn)
+        for migration in migrations:
+            if migration.version <= current:
+                continue
+            step_started = time.perf_counter()
+            for step in migration.steps:
+                _run_step(conn, step)
+            results.append(MigrationResult(
+                migration.version, migration.description, time.perf_counter() - step_started
+            ))
+        if results:
+            conn.exec_driver_sql(f"PRAGMA user_version = {results[-1].version}")
+    for result in results:
+        logger.info(
+            f"Миграция схемы {result.version}: {result.description} ({result.seconds:.2f} с)"
+        )
+    if results:
+        logger.info(
+            f"Схема обновлена до версии {results[-1].version} "
+            f"за {time.perf_counter() - started:.2f} с"
+        )
+    return results
+
+def main():
+    from database import init_db, make_engine
+
+    parser = argparse.ArgumentParser(description="Миграции схемы hr.db")
+    parser.add_argument("--db", default="hr.db", help="файл БД (по умолчанию hr.db)")
+    parser.add_argument("--status", action="store_true", help="только показать версию схемы")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    engine = make_engine(f"sqlite:///{args.db}")
+    with engine.connect() as conn:
+        current = schema_version(conn)
+    print(f"Версия схемы: {current}, последняя: {SCHEMA_VERSION}")
+    if args.status:
+        return
+    started = time.perf_counter()
+    # init_db: create_all, миграции и FTS-индекс с триггерами
+    init_db(engine)
+    with engine.connect() as conn:
+        print(f"Версия схемы: {schema_version(conn)} ({time.perf_counter() - started:.2f} с)")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 # models.py
 
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -22,19 +22,57 @@ class User(Base):
 
 class Employee(Base):
     __tablename__ = "employees"
+    # Индексы существующих БД добавляются миграциями (migrations.py)
+    __table_args__ = (
+        # Фильтр таблицы: должность + диапазон даты приёма
+        Index("ix_employees_position_hire_date", "position", "hire_date"),
+    )
 
     id                  = Column(Integer, primary_key=True, index=True)
     user_id             = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
     first_name          = Column(String, nullable=False)
-    last_name           = Column(String, nullable=False)
-    position            = Column(String, nullable=False)  # Должность
+    # Индексы на полях сортировки таблицы (controllers.SORT_FIELDS)
+    last_name           = Column(String, nullable=False, index=True)
+    position            = Column(String, nullable=False, index=True)  # Должность
     passport            = Column(String, nullable=False)
     birth_year          = Column(Integer)
     experience_years    = Column(Integer)
-    hire_date           = Column(Date)
+    hire_date           = Column(Date, index=True)
     phone_mobile        = Column(String)
     phone_work          = Column(String)
-    vacation_days_left  = Column(Integer)
+    vacation_days_left  = Column(Integer, index=True)
+    # Год, за который последний раз начислен отпуск (services.vacation_accrual)
+    vacation_accrued_year = Column(Integer)
 
     # Связь с пользователем
     user = relationship("User", back_populates="employee")
+
+    # Документы удаляются вместе с сотрудником (файлы — services.document_service)
+    documents = relationship(
+        "Document",
+        back_populates="employee",
+        cascade="all, delete-orphan",
+    )
+
+class Document(Base):
+    """
+    Индекс документов сотрудника: файлы лежат в employee_docs/<employee_id>/,
+    а список, размеры и типы берутся отсюда, без обхода папок.
+    """
+    __tablename__ = "documents"
+    __table_args__ = (
+        # Одно имя файла на сотрудника; заодно индекс для списка документов
+        UniqueConstraint("employee_id", "filename", name="uq_documents_employee_filename"),
+    )
+
+    id          = Column(Integer, primary_key=True)
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
+    filename    = Column(String, nullable=False)
+    size        = Column(Integer, nullable=False)   # байт
+    mime        = Column(String, nullable=False)
+    sha256      = Column(String(64), nullable=False, index=True)
+    uploaded_at = Column(DateTime, nullable=False)
+    modified_at = Column(DateTime, nullable=False)  # mtime файла: по нему сверка находит изменения
+    uploaded_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+
+    employee = relationship("Employee", back_populates="documents")
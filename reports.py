@@ -1,6 +1,14 @@
 # reports.py
+"""
+Отчёты PDF/XLSX. Модуль тянет reportlab, поэтому UI импортирует его
+только при первом экспорте (см. ui.export_jobs); openpyxl импортируется
+внутри XLSX-функций, а системный шрифт регистрируется при первом PDF.
+"""
 import os
+import sys
 import logging
+import threading
+from itertools import islice, chain
 from pathlib import Path
 from datetime import datetime
 
@@ -9,67 +17,109 @@ from reportlab.lib.pagesizes import LETTER, landscape
 from reportlab.lib.units import mm
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Alignment
-
 logger = logging.getLogger(__name__)
 
+class ExportCancelled(Exception):
+    """Экспорт прерван: бросается из колбэка progress, чтобы остановить выгрузку."""
+
 # --- Настройки страницы ---
 PAGE_SIZE = LETTER
 MARGIN    = 15 * mm
 
-# --- Поиск системного TTF-шрифта ---
-FONT_NAME   = None
-font_paths = []
+# --- Системный TTF-шрифт ---
+# Поиск и регистрация шрифта занимают заметное время, поэтому выполняются
+# при первом PDF-экспорте (pdf_font), а не при импорте модуля
+FONT_NAME = None
+_font_lock = threading.Lock()
 
-import sys
-if sys.platform.startswith("win"):
-    windir = Path(os.environ.get("WINDIR", "C:/Windows"))
-    font_paths += [
-        windir / "Fonts" / "arial.ttf",
-        windir / "Fonts" / "ARIAL.TTF",
-    ]
-elif sys.platform == "darwin":
-    font_paths += [
-        Path("/Library/Fonts/Arial.ttf"),
-        Path("/Library/Fonts/DejaVuSans.ttf"),
-    ]
-else:
+def _font_paths():
+    if sys.platform.startswith("win"):
+        windir = Path(os.environ.get("WINDIR", "C:/Windows"))
+        return [
+            windir / "Fonts" / "arial.ttf",
+            windir / "Fonts" / "ARIAL.TTF",
+        ]
+    if sys.platform == "darwin":
+        return [
+            Path("/Library/Fonts/Arial.ttf"),
+            Path("/Library/Fonts/DejaVuSans.ttf"),
+        ]
     # Linux
-    font_paths += [
+    return [
         Path("/usr/share/fonts/truetype/msttcorefonts/Arial.ttf"),
         Path("/usr/share/fonts/truetype/msttcorefonts/arial.ttf"),
         Path("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
         Path("/usr/share/fonts/truetype/freefont/FreeSans.ttf"),
     ]
 
-# Регистрируем первый из найденных
-for p in font_paths:
-    if p.exists():
-        try:
-            name = p.stem  # например "arial" или "DejaVuSans"
-            pdfmetrics.registerFont(TTFont(name, str(p)))
-            FONT_NAME = name
-            logger.info(f"Используется системный шрифт: {name} ({p})")
-            break
-        except Exception as e:
-            logger.warning(f"Ошибка регистрации {p}: {e}")
+def pdf_font() -> str:
+    """Имя шрифта для PDF: регистрирует первый найденный системный TTF (один раз)."""
+    global FONT_NAME
+    with _font_lock:
+        if FONT_NAME:
+            return FONT_NAME
+        for p in _font_paths():
+            if p.exists():
+                try:
+                    name = p.stem  # например "arial" или "DejaVuSans"
+                    pdfmetrics.registerFont(TTFont(name, str(p)))
+                    FONT_NAME = name
+                    logger.info(f"Используется системный шрифт: {name} ({p})")
+                    break
+                except Exception as e:
+                    logger.warning(f"Ошибка регистрации {p}: {e}")
+
+        # Если ничего не нашли — fallback на Helvetica
+        if not FONT_NAME:
+            FONT_NAME = "Helvetica"
+            logger.warning("Не найден system TTF, используется Helvetica (кириллица может не отображаться)")
+        return FONT_NAME
+
+_styles = None
 
-# Если ничего не нашли — fallback на Helvetica
-if not FONT_NAME:
-    FONT_NAME = "Helvetica"
-    logger.warning("Не найден system TTF, используется Helvetica (кириллица может не отображаться)")
+def pdf_styles():
+    """Стили Platypus с системным шрифтом (создаются при первом обращении)."""
+    global _styles
+    if _styles is None:
+        font = pdf_font()
+        styles = getSampleStyleSheet()
+        styles["Normal"].fontName    = font
+        styles["Normal"].fontSize    = 10
+        styles["Heading1"].fontName  = font
+        styles["Heading1"].fontSize  = 14
+        _styles = styles
+    return _styles
 
-# --- Стили Platypus ---
-styles = getSampleStyleSheet()
-styles["Normal"].fontName    = FONT_NAME
-styles["Normal"].fontSize    = 10
-styles["Heading1"].fontName  = FONT_NAME
-styles["Heading1"].fontSize  = 14
+# --- Таблица сотрудников в PDF ---
+PDF_HEADERS    = ["ID","ФИО","Должность","Дата приёма","Отпуск (дн.)"]
+PDF_COL_WIDTHS = [20*mm,60*mm,50*mm,40*mm,30*mm]
+PDF_ROW_HEIGHT = 6*mm
+
+def _pdf_table_style():
+    return TableStyle([
+        ("FONTNAME",(0,0),(-1,-1),pdf_font()),
+        ("FONTSIZE",(0,0),(-1,-1),10),
+        ("ALIGN",(0,0),(-1,0),"CENTER"),
+        ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
+        ("GRID",(0,0),(-1,-1),0.5,colors.gray),
+        ("BACKGROUND",(0,0),(-1,0),colors.lightgrey),
+    ])
+
+def _pdf_row(e):
+    return [
+        str(e.id),
+        f"{e.first_name} {e.last_name}",
+        e.position or "",
+        e.hire_date.strftime("%d.%m.%Y") if e.hire_date else "",
+        str(e.vacation_days_left)
+    ]
+
+def _report_title():
+    return Paragraph(f"Отчёт сотрудников — {datetime.now():%Y-%m-%d}", pdf_styles()["Heading1"])
 
 def export_employees_pdf(path: str, employees):
     """Экспорт сотрудников в PDF с system-шрифтом."""
@@ -79,33 +129,95 @@ def export_employees_pdf(path: str, employees):
         topMargin=MARGIN, bottomMargin=MARGIN
     )
     elems = []
-    elems.append(Paragraph(f"Отчёт сотрудников — {datetime.now():%Y-%m-%d}", styles["Heading1"]))
+    elems.append(_report_title())
     elems.append(Spacer(1, 6*mm))
 
-    data = [["ID","ФИО","Должность","Дата приёма","Отпуск (дн.)"]]
+    data = [PDF_HEADERS]
     for e in employees:
-        data.append([
-            str(e.id),
-            f"{e.first_name} {e.last_name}",
-            e.position or "",
-            e.hire_date.strftime("%d.%m.%Y") if e.hire_date else "",
-            str(e.vacation_days_left)
-        ])
+        data.append(_pdf_row(e))
 
-    table = Table(data, colWidths=[20*mm,60*mm,50*mm,40*mm,30*mm], repeatRows=1)
-    table.setStyle(TableStyle([
-        ("FONTNAME",(0,0),(-1,-1),FONT_NAME),
-        ("FONTSIZE",(0,0),(-1,-1),10),
-        ("ALIGN",(0,0),(-1,0),"CENTER"),
-        ("VALIGN",(0,0),(-1,-1),"MIDDLE"),
-        ("GRID",(0,0),(-1,-1),0.5,colors.gray),
-        ("BACKGROUND",(0,0),(-1,0),colors.lightgrey),
-    ]))
+    table = Table(data, colWidths=PDF_COL_WIDTHS, repeatRows=1)
+    table.setStyle(_pdf_table_style())
     elems.append(table)
     doc.build(elems)
 
+def export_employees_pdf_stream(path: str, employees, rows_per_page: int = None, progress=None) -> int:
+    """
+    Потоковый экспорт сотрудников в PDF.
+    employees — любой итератор; строки забираются порциями по странице,
+    на каждую страницу рисуется отдельная таблица с повтором заголовка.
+    В отличие от export_employees_pdf не строит общий список данных и одну
+    большую таблицу (раскладка которой в reportlab сверхлинейна), поэтому
+    время растёт линейно, а в памяти одновременно живёт одна таблица;
+    до сохранения файла reportlab держит только готовое содержимое
+    страниц (~12 КиБ на страницу).
+    progress(rows_done) вызывается после каждой страницы; чтобы прервать
+    экспорт, колбэк может бросить ExportCancelled.
+    Возвращает число выгруженных строк.
+    """
+    page_w, page_h = landscape(PAGE_SIZE)
+    c = canvas.Canvas(path, pagesize=(page_w, page_h), pageCompression=1)
+    c.setTitle("Отчёт сотрудников")
+
+    title = _report_title()
+    _, title_h = title.wrap(page_w - 2*MARGIN, page_h)
+    top = page_h - MARGIN - title_h - 6*mm
+    if rows_per_page is None:
+        # Место под таблицу минус строка заголовка и строка номера страницы
+        rows_per_page = max(1, int((top - MARGIN) // PDF_ROW_HEIGHT) - 2)
+
+    rows = map(_pdf_row, employees)
+    style = _pdf_table_style()
+    total = 0
+    page_no = 0
+    while True:
+        chunk = list(islice(rows, rows_per_page))
+        if not chunk and page_no:
+            break
+        page_no += 1
+        if page_no == 1:
+            title.drawOn(c, MARGIN, page_h - MARGIN - title_h)
+        table = Table([PDF_HEADERS] + chunk, colWidths=PDF_COL_WIDTHS,
+                      rowHeights=PDF_ROW_HEIGHT)
+        table.setStyle(style)
+        _, table_h = table.wrapOn(c, page_w - 2*MARGIN, top - MARGIN)
+        table.drawOn(c, MARGIN, top - table_h)
+        c.setFont(pdf_font(), 8)
+        c.drawRightString(page_w - MARGIN, MARGIN / 2, f"Стр. {page_no}")
+        c.showPage()
+        total += len(chunk)
+        if progress:
+            progress(total)
+        if len(chunk) < rows_per_page:
+            break
+    c.save()
+    logger.info(f"PDF-отчёт {path}: {total} строк, {page_no} стр.")
+    return total
+
+# --- Таблица сотрудников в Excel ---
+XLSX_HEADERS = ["ID","ФИО","Должность","Дата приёма","Отпуск (дн.)"]
+XLSX_CELL_STYLE = "employee_cell"
+# Сколько первых строк буферизуется для расчёта ширины колонок,
+# если ширины не переданы заранее
+XLSX_WIDTH_SAMPLE_ROWS = 1000
+# Как часто (в строках) потоковый экспорт сообщает о прогрессе
+XLSX_PROGRESS_STEP = 1000
+
+def _xlsx_row(e):
+    return [
+        e.id,
+        f"{e.first_name} {e.last_name}",
+        e.position or "",
+        e.hire_date.strftime("%d.%m.%Y") if e.hire_date else "",
+        e.vacation_days_left
+    ]
+
 def export_employees_excel(path: str, employees):
     """Экспорт сотрудников в Excel."""
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+    from openpyxl.styles import Alignment
+
     wb = Workbook()
     ws = wb.active; ws.title = "Сотрудники"
     headers = ["ID","ФИО","Должность","Дата приёма","Отпуск (дн.)"]
@@ -125,3 +237,63 @@ def export_employees_excel(path: str, employees):
         for cell in col:
             cell.alignment = Alignment(horizontal="left", vertical="center")
     wb.save(path)
+
+def export_employees_excel_stream(path: str, employees, widths=None, progress=None) -> int:
+    """
+    Потоковый экспорт сотрудников в Excel (write-only книга openpyxl).
+    Строки пишутся в файл сразу и не хранятся в памяти как ячейки;
+    выравнивание задаётся одним именованным стилем, а не объектом на ячейку.
+    widths — длины самого длинного значения по колонкам (например,
+    controllers.employee_column_widths). Без них ширины считаются
+    по первым XLSX_WIDTH_SAMPLE_ROWS строкам: write-only лист записывает
+    размеры колонок до первой строки данных.
+    progress(rows_done) вызывается каждые XLSX_PROGRESS_STEP строк;
+    чтобы прервать экспорт, колбэк может бросить ExportCancelled.
+    Возвращает число выгруженных строк.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+    from openpyxl.styles import Alignment, NamedStyle
+
+    wb = Workbook(write_only=True)
+    cell_style = NamedStyle(name=XLSX_CELL_STYLE, alignment=Alignment(horizontal="left", vertical="center"))
+    wb.add_named_style(cell_style)
+    ws = wb.create_sheet("Сотрудники")
+
+    rows = map(_xlsx_row, employees)
+    lengths = [len(h) for h in XLSX_HEADERS]
+    buffered = []
+    if widths is None:
+        for row in rows:
+            buffered.append(row)
+            for i, value in enumerate(row):
+                if value is not None:
+                    lengths[i] = max(lengths[i], len(str(value)))
+            if len(buffered) >= XLSX_WIDTH_SAMPLE_ROWS:
+                break
+    else:
+        lengths = [max(a, b or 0) for a, b in zip(lengths, widths)]
+    for i, length in enumerate(lengths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = length + 2
+
+    def styled(values):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = XLSX_CELL_STYLE
+            cells.append(cell)
+        return cells
+
+    ws.append(styled(XLSX_HEADERS))
+    total = 0
+    for row in chain(buffered, rows):
+        ws.append(styled(row))
+        total += 1
+        if progress and total % XLSX_PROGRESS_STEP == 0:
+            progress(total)
+    wb.save(path)
+    if progress:
+        progress(total)
+    logger.info(f"Excel-отчёт {path}: {total} строк")
+    return total
@@ -0,0 +1,140 @@
+# search_index.py
+
+import logging
+from typing import Optional
+
+from sqlalchemy import table, column, select, literal_column
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# Виртуальная таблица FTS5: rowid = employees.id
+FTS_TABLE = "employees_fts"
+
+# Токенизаторы в порядке предпочтения:
+# - trigram ищет по любой подстроке (от 3 символов) и сворачивает регистр,
+#   включая кириллицу (SQLite >= 3.34);
+# - unicode61 есть в любой сборке с FTS5, но ищет только по началу слов.
+TOKENIZERS = ("trigram", "unicode61")
+
+# Минимальная длина слова для поиска по триграммам
+TRIGRAM_MIN_LEN = 3
+
+# Режим индекса для каждого движка: "trigram" | "unicode61" | None (нет FTS5)
+_modes = {}
+
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON employees BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, username, first_name, last_name)
+        SELECT new.id, u.username, new.first_name, new.last_name
+        FROM users u WHERE u.id = new.user_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON employees BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF user_id, first_name, last_name ON employees BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, username, first_name, last_name)
+        SELECT new.id, u.username, new.first_name, new.last_name
+        FROM users u WHERE u.id = new.user_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_users_au AFTER UPDATE OF username ON users BEGIN
+        UPDATE {FTS_TABLE} SET username = new.username
+        WHERE rowid IN (SELECT id FROM employees WHERE user_id = new.id);
+    END
+    """,
+]
+
+def _existing_tokenizer(conn) -> Optional[str]:
+    """Возвращает токенизатор уже созданной FTS-таблицы (или None, если её нет)."""
+    row = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    if not row:
+        return None
+    sql = row[0].lower()
+    for tokenizer in TOKENIZERS:
+        if tokenizer in sql:
+            return tokenizer
+    return TOKENIZERS[-1]
+
+def ensure_search_index(engine) -> Optional[str]:
+    """
+    Создаёт FTS5-индекс сотрудников и триггеры синхронизации с employees/users,
+    при первом создании заполняет его из существующих данных.
+    Возвращает режим поиска или None, если SQLite собран без FTS5
+    (тогда list_employees работает через LIKE).
+    """
+    mode = None
+    with engine.begin() as conn:
+        mode = _existing_tokenizer(conn)
+        if mode is None:
+            for tokenizer in TOKENIZERS:
+                try:
+                    conn.exec_driver_sql(
+                        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                        f"username, first_name, last_name, tokenize='{tokenizer}')"
+                    )
+                except OperationalError as e:
+                    logger.warning(f"FTS5 с токенизатором {tokenizer} недоступен: {e}")
+                    continue
+                mode = tokenizer
+                conn.exec_driver_sql(
+                    f"INSERT INTO {FTS_TABLE}(rowid, username, first_name, last_name) "
+                    "SELECT e.id, u.username, e.first_name, e.last_name "
+                    "FROM employees e JOIN users u ON u.id = e.user_id"
+                )
+                logger.info(f"Создан поисковый индекс {FTS_TABLE} ({tokenizer})")
+                break
+        if mode is not None:
+            for ddl in _TRIGGERS:
+                conn.exec_driver_sql(ddl)
+    _modes[str(engine.url)] = mode
+    if mode is None:
+        logger.warning("FTS5 недоступен, поиск сотрудников будет выполняться через LIKE")
+    return mode
+
+def search_mode(bind) -> Optional[str]:
+    """Режим поиска для движка (None — индекс не создан или FTS5 нет)."""
+    return _modes.get(str(bind.url))
+
+def match_expression(search: str, mode: Optional[str]) -> Optional[str]:
+    """
+    Строит запрос MATCH из строки поиска: каждое слово — отдельная фраза,
+    слова объединяются по AND. Возвращает None, если индекс
+    не может ответить на такой запрос (нет FTS5 или слишком короткие слова
+    для триграмм) — тогда нужен LIKE.
+    """
+    words = search.split()
+    if mode is None or not words:
+        return None
+    if mode == "trigram":
+        if any(len(w) < TRIGRAM_MIN_LEN for w in words):
+            return None
+        return " ".join('"' + w.replace('"', '""') + '"' for w in words)
+    # unicode61: поиск по префиксу слов
+    return " ".join('"' + w.replace('"', '""') + '"*' for w in words)
+
+def match_subquery(search: str, mode: Optional[str]):
+    """
+    Подзапрос (emp_id, rank) по FTS-индексу или None, если нужен LIKE.
+    rank — релевантность bm25 (меньше — лучше).
+    """
+    expr = match_expression(search, mode)
+    if expr is None:
+        return None
+    return (
+        select(_fts.c.rowid.label("emp_id"), _fts.c.rank.label("rank"))
+        .where(literal_column(FTS_TABLE).op("MATCH")(expr))
+        .subquery()
+    )
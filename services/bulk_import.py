@@ -0,0 +1,245 @@
+# services/bulk_import.py
+"""
+Массовый импорт сотрудников из CSV/XLSX.
+
+Строки читаются потоком, проверяются теми же правилами, что и форма
+регистрации (validation.new_employee_error), пароли хэшируются в пуле
+процессов, а вставка идёт пакетами: один executemany для users и один
+для employees на пакет, одна транзакция на пакет. Ошибочные строки
+попадают в отчёт и не прерывают импорт.
+
+Запуск из корня проекта:
+    python -m services.bulk_import staff.xlsx --batch-size 500
+"""
+
+import argparse
+import csv
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from auth import hash_password
+from events import bus, EmployeeEvent, EMPLOYEES_RELOAD
+from models import Employee, User
+from validation import new_employee_error
+from ui.utils import notify_qt
+
+logger = logging.getLogger(__name__)
+
+# Колонки файла импорта (первая строка — заголовок)
+IMPORT_FIELDS = [
+    "username", "password", "first_name", "last_name", "position", "passport",
+    "birth_year", "experience_years", "hire_date", "phone_mobile", "phone_work",
+    "vacation_days_left",
+]
+INT_FIELDS = ("birth_year", "experience_years", "vacation_days_left")
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d")
+
+DEFAULT_BATCH_SIZE = 500
+
+class RowError(NamedTuple):
+    """Ошибка в строке файла импорта (line — номер строки в файле)."""
+    line: int
+    username: str
+    message: str
+
+class ImportReport(NamedTuple):
+    created: int
+    errors: List[RowError]
+
+def _read_csv(path: str) -> Iterator[Tuple[int, dict]]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(f, dialect=dialect)
+        for row in reader:
+            yield reader.line_num, row
+
+def _read_xlsx(path: str) -> Iterator[Tuple[int, dict]]:
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            if values is None or all(v is None for v in values):
+                continue
+            yield line, dict(zip(header, values))
+    finally:
+        wb.close()
+
+def read_rows(path: str) -> Iterator[Tuple[int, dict]]:
+    """Потоково читает строки файла как (номер строки, словарь по заголовку)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return _read_csv(path)
+    if ext in (".xlsx", ".xlsm"):
+        return _read_xlsx(path)
+    raise ValueError(f"Неподдерживаемый формат файла импорта: {ext}")
+
+def _parse_date(value) -> Optional[date]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Некорректная дата: {value}")
+
+def parse_row(raw: dict) -> dict:
+    """
+    Приводит строку файла к полям User/Employee.
+    Бросает ValueError при некорректных значениях.
+    """
+    fields = {}
+    for key in IMPORT_FIELDS:
+        value = raw.get(key)
+        if key in INT_FIELDS:
+            fields[key] = int(value) if value not in (None, "") else None
+        elif key == "hire_date":
+            fields[key] = _parse_date(value)
+        elif key == "password":
+            fields[key] = "" if value is None else str(value)
+        else:
+            fields[key] = "" if value is None else str(value).strip()
+    error = new_employee_error(fields)
+    if error:
+        raise ValueError(error)
+    return fields
+
+def _employee_params(fields: dict, user_id: int) -> dict:
+    data = {k: v for k, v in fields.items() if k not in ("username", "password")}
+    return dict(data, user_id=user_id)
+
+def _insert_batch(db: Session, batch: List[Tuple[int, dict]], hashes: List[str]) -> int:
+    """Вставляет пакет одной транзакцией: executemany в users, затем в employees."""
+    users = [
+        {"username": f["username"], "password": h, "role": "employee"}
+        for (_, f), h in zip(batch, hashes)
+    ]
+    db.execute(insert(User), users)
+    ids = dict(
+        db.query(User.username, User.id)
+          .filter(User.username.in_([u["username"] for u in users]))
+    )
+    db.execute(insert(Employee), [_employee_params(f, ids[f["username"]]) for _, f in batch])
+    db.commit()
+    return len(batch)
+
+def _insert_rows_one_by_one(db: Session, batch, hashes, errors: List[RowError]) -> int:
+    """Запасной путь для пакета с конфликтом: каждая строка — в своей точке сохранения."""
+    created = 0
+    for (line, f), h in zip(batch, hashes):
+        try:
+            with db.begin_nested():
+                user = User(username=f["username"], password=h, role="employee")
+                db.add(user)
+                db.flush()
+                db.execute(insert(Employee), [_employee_params(f, user.id)])
+            created += 1
+        except SQLAlchemyError as e:
+            errors.append(RowError(line, f["username"], f"Ошибка БД: {e.__class__.__name__}"))
+    db.commit()
+    return created
+
+def import_employees(
+    db: Session,
+    path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: Optional[int] = None,
+) -> ImportReport:
+    """
+    Импортирует сотрудников из CSV/XLSX.
+    workers — число процессов для bcrypt (по умолчанию — по числу ядер).
+    Возвращает отчёт: число созданных сотрудников и ошибки по строкам.
+    """
+    errors: List[RowError] = []
+    created = 0
+    seen = set()
+
+    def flush(batch, pool):
+        nonlocal created
+        if not batch:
+            return
+        # Логины, уже занятые в БД
+        taken = {
+            name for (name,) in
+            db.query(User.username).filter(User.username.in_([f["username"] for _, f in batch]))
+        }
+        fresh = []
+        for line, f in batch:
+            if f["username"] in taken:
+                errors.append(RowError(line, f["username"], "Пользователь с таким логином уже существует."))
+            else:
+                fresh.append((line, f))
+        if not fresh:
+            return
+        chunksize = max(1, len(fresh) // ((workers or os.cpu_count() or 1) * 4))
+        hashes = list(pool.map(hash_password, [f["password"] for _, f in fresh], chunksize=chunksize))
+        try:
+            created += _insert_batch(db, fresh, hashes)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.warning(f"Пакет импорта отклонён ({e.__class__.__name__}), вставка по строкам")
+            created += _insert_rows_one_by_one(db, fresh, hashes, errors)
+        logger.info(f"Импорт: создано {created}, ошибок {len(errors)}")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch = []
+        for line, raw in read_rows(path):
+            username = str(raw.get("username") or "").strip()
+            try:
+                fields = parse_row(raw)
+            except ValueError as e:
+                errors.append(RowError(line, username, str(e)))
+                continue
+            if username in seen:
+                errors.append(RowError(line, username, "Логин повторяется в файле импорта."))
+                continue
+            seen.add(username)
+            batch.append((line, fields))
+            if len(batch) >= batch_size:
+                flush(batch, pool)
+                batch = []
+        flush(batch, pool)
+
+    logger.info(f"Импорт из {path} завершён: создано {created}, ошибок {len(errors)}")
+    notify_qt("HR", f"Импортировано сотрудников: {created}, ошибок: {len(errors)}")
+    if created:
+        bus.publish(EmployeeEvent(EMPLOYEES_RELOAD, None, {"created": created}))
+    return ImportReport(created, sorted(errors))
+
+def main():
+    from database import init_db, SessionLocal
+
+    parser = argparse.ArgumentParser(description="Массовый импорт сотрудников из CSV/XLSX")
+    parser.add_argument("path", help="файл .csv или .xlsx с заголовком: " + ", ".join(IMPORT_FIELDS))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="процессов для хэширования паролей")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    init_db()
+    with SessionLocal() as db:
+        report = import_employees(db, args.path, args.batch_size, args.workers)
+    for err in report.errors:
+        print(f"строка {err.line} ({err.username or '—'}): {err.message}")
+    print(f"Создано: {report.created}, ошибок: {len(report.errors)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# services/document_service.py
+"""
+Документы сотрудников: файлы в хранилище (services.document_store)
+и их индекс в таблице documents.
+
+Загрузка и удаление меняют файл и строку индекса вместе, поэтому список
+документов, размеры и типы берутся из БД одним запросом по
+(employee_id, filename), без обхода папок при каждом открытии профиля.
+
+Расхождения индекса и диска (файлы, скопированные в папки вручную,
+документы до появления индекса, удалённые файлы) исправляет сверка
+reconcile_documents: один обход EMPLOYEE_DOCS_DIR, хэширование только
+новых или изменённых (по размеру и mtime) файлов и одна транзакция
+с пакетными вставками, обновлениями и удалениями.
+
+Сверка из корня проекта:
+    python -m services.document_service --reconcile
+"""
+
+import argparse
+import logging
+import mimetypes
+import os
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models import Document, Employee
+from services.document_store import BLOBS_DIRNAME, DocumentStore, file_digest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIME = "application/octet-stream"
+
+class ReconcileReport(NamedTuple):
+    added: int
+    updated: int
+    removed: int
+    # Файлы в папках несуществующих сотрудников (в индекс не попадают)
+    orphans: int
+
+def guess_mime(filename: str) -> str:
+    return mimetypes.guess_type(filename)[0] or DEFAULT_MIME
+
+def _mtime(st: os.stat_result) -> datetime:
+    return datetime.fromtimestamp(st.st_mtime)
+
+class DocumentService:
+    def __init__(self, db: Session, store: Optional[DocumentStore] = None):
+        self.db = db
+        self.store = store or DocumentStore()
+
+    def path(self, doc: Document) -> str:
+        """Путь файла документа."""
+        return os.path.join(self.store.employee_dir(doc.employee_id), doc.filename)
+
+    def list(self, emp_id: int) -> List[Document]:
+        """Документы сотрудника по имени файла (из индекса)."""
+        return (
+            self.db.query(Document)
+            .filter(Document.employee_id == emp_id)
+            .order_by(Document.filename)
+            .all()
+        )
+
+    def upload(self, emp_id: int, src: str, uploaded_by: Optional[int] = None,
+               filename: Optional[str] = None) -> Document:
+        """
+        Загружает файл src сотруднику и добавляет его в индекс.
+        FileExistsError, если документ с таким именем уже есть.
+        """
+        filename = filename or os.path.basename(src)
+        stored = self.store.add(emp_id, src, filename)
+        now = datetime.now()
+        doc = Document(
+            employee_id=emp_id,
+            filename=filename,
+            size=stored.size,
+            mime=guess_mime(filename),
+            sha256=stored.digest,
+            uploaded_at=now,
+            modified_at=_mtime(os.stat(stored.path)),
+            uploaded_by=uploaded_by,
+        )
+        self.db.add(doc)
+        try:
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            # Файл без строки индекса сверка бы подхватила, но загрузка не удалась
+            self.store.remove(stored.path, stored.digest)
+            raise
+        logger.info(
+            f"Документ {filename} загружен сотруднику {emp_id}"
+            f"{' (содержимое уже было в хранилище)' if stored.deduplicated else ''}"
+        )
+        return doc
+
+    def delete(self, doc_id: int) -> None:
+        """Удаляет документ из индекса, затем файл."""
+        doc = self.db.get(Document, doc_id)
+        if doc is None:
+            raise ValueError(f"Document with id={doc_id} not found")
+        path, digest = self.path(doc), doc.sha256
+        self.db.delete(doc)
+        try:
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise
+        try:
+            self.store.remove(path, digest)
+        except FileNotFoundError:
+            pass
+        logger.info(f"Документ {path} удалён")
+
+def _scan(store: DocumentStore) -> Dict[Tuple[int, str], os.stat_result]:
+    """Файлы документов на диске: (employee_id, filename) → stat."""
+    files = {}
+    if not os.path.isdir(store.root):
+        return files
+    for emp_dir in os.scandir(store.root):
+        if not emp_dir.is_dir() or emp_dir.name == BLOBS_DIRNAME or not emp_dir.name.isdigit():
+            continue
+        emp_id = int(emp_dir.name)
+        for entry in os.scandir(emp_dir.path):
+            if entry.is_file():
+                files[(emp_id, entry.name)] = entry.stat()
+    return files
+
+def reconcile_documents(db: Session, store: Optional[DocumentStore] = None) -> ReconcileReport:
+    """
+    Приводит индекс documents в соответствие с папками сотрудников:
+    добавляет новые файлы, обновляет изменённые (размер или mtime)
+    и удаляет строки, файлов которых больше нет.
+    """
+    store = store or DocumentStore()
+    files = _scan(store)
+    indexed = {
+        (emp_id, filename): (doc_id, size, modified_at)
+        for doc_id, emp_id, filename, size, modified_at in db.query(
+            Document.id, Document.employee_id, Document.filename, Document.size, Document.modified_at
+        )
+    }
+    employees = {emp_id for (emp_id,) in db.query(Employee.id)}
+
+    added, changed, orphans = [], [], 0
+    for (emp_id, filename), st in files.items():
+        row = indexed.get((emp_id, filename))
+        modified_at = _mtime(st)
+        if row is not None:
+            if (row[1], row[2]) != (st.st_size, modified_at):
+                path = os.path.join(store.employee_dir(emp_id), filename)
+                changed.append({
+                    "doc_id": row[0], "size": st.st_size, "modified_at": modified_at,
+                    "sha256": file_digest(path),
+                })
+        elif emp_id not in employees:
+            orphans += 1
+        else:
+            path = os.path.join(store.employee_dir(emp_id), filename)
+            added.append({
+                "employee_id": emp_id, "filename": filename, "size": st.st_size,
+                "mime": guess_mime(filename), "sha256": file_digest(path),
+                # Время загрузки неизвестно — берётся время изменения файла
+                "uploaded_at": modified_at, "modified_at": modified_at, "uploaded_by": None,
+            })
+    removed = [row[0] for key, row in indexed.items() if key not in files]
+
+    if added or changed or removed:
+        try:
+            if added:
+                db.execute(insert(Document), added)
+            if changed:
+                # executemany: SET берёт size/modified_at/sha256 из параметров строки
+                table = Document.__table__
+                db.execute(update(table).where(table.c.id == bindparam("doc_id")), changed)
+            if removed:
+                db.execute(delete(Document).where(Document.id.in_(removed)))
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+    report = ReconcileReport(len(added), len(changed), len(removed), orphans)
+    if added or changed or removed or orphans:
+        logger.info(
+            f"Сверка документов: добавлено {report.added}, обновлено {report.updated}, "
+            f"удалено {report.removed}, без сотрудника {report.orphans}"
+        )
+    return report
+
+def main():
+    from database import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Индекс документов сотрудников")
+    parser.add_argument("--root", default=None, help="папка документов (по умолчанию employee_docs/)")
+    parser.add_argument("--reconcile", action="store_true", help="сверить индекс с папками")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    init_db()
+    if args.reconcile:
+        store = DocumentStore(args.root) if args.root else DocumentStore()
+        with SessionLocal() as db:
+            report = reconcile_documents(db, store)
+        print(
+            f"Добавлено: {report.added}, обновлено: {report.updated}, "
+            f"удалено: {report.removed}, файлов без сотрудника: {report.orphans}"
+        )
+
+if __name__ == "__main__":
+    main()
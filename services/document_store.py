@@ -0,0 +1,286 @@
+# services/document_store.py
+"""
+Хранилище документов сотрудников с адресацией по содержимому.
+
+Содержимое каждого документа хранится один раз — в файле-блобе
+<root>/.blobs/<первые 2 символа sha256>/<sha256>. В папке сотрудника
+<root>/<emp_id>/<имя файла> лежит жёсткая ссылка на блоб, поэтому код,
+который читает и открывает документы по пути (список в профиле,
+xdg-open/startfile), работает без изменений. Счётчик ссылок блоба —
+st_nlink файловой системы: блоб удаляется, когда на него не осталось
+ни одной ссылки из папок сотрудников.
+
+Загрузка читает исходный файл потоком: сначала только вычисляется хэш,
+и если такой блоб уже есть, создаётся лишь ссылка (операция над
+метаданными, без записи содержимого). Новое содержимое копируется
+во временный файл рядом с блобами с повторным хэшированием на лету
+и атомарно переименовывается в блоб.
+
+Блобы доступны только для чтения: документ, открытый в редакторе,
+нельзя сохранить «на месте» и тем самым изменить копии других сотрудников.
+Если файловая система не поддерживает жёсткие ссылки, документ
+копируется в папку сотрудника как раньше, без дедупликации.
+
+Перевод уже загруженных документов на блобы (из корня проекта):
+    python -m services.document_store --dedupe
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import stat
+import tempfile
+from typing import Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS_ROOT = "employee_docs/"
+BLOBS_DIRNAME = ".blobs"
+
+# Размер блока при чтении: хэш и копирование идут потоком, без чтения файла целиком
+CHUNK_SIZE = 1024 * 1024
+
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+class StoredDocument(NamedTuple):
+    """Загруженный документ: путь в папке сотрудника, sha256, размер и признак повтора."""
+    path: str
+    digest: str
+    size: int
+    deduplicated: bool
+
+class DedupeReport(NamedTuple):
+    files: int
+    linked: int
+    saved_bytes: int
+
+def _chunks(f) -> Iterator[bytes]:
+    return iter(lambda: f.read(CHUNK_SIZE), b"")
+
+def file_digest(path: str) -> str:
+    """sha256 файла, читаемого блоками по CHUNK_SIZE."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in _chunks(f):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _remove(path: str):
+    """os.remove, снимающий атрибут «только чтение» (без этого Windows не удалит файл)."""
+    try:
+        os.remove(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | READ_ONLY)
+        os.remove(path)
+
+class DocumentStore:
+    def __init__(self, root: str = DOCUMENTS_ROOT):
+        self.root = root
+        self.blobs_dir = os.path.join(root, BLOBS_DIRNAME)
+
+    def employee_dir(self, emp_id: int) -> str:
+        return os.path.join(self.root, str(emp_id))
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blobs_dir, digest[:2], digest)
+
+    def refcount(self, digest: str) -> int:
+        """Число ссылок на блоб из папок сотрудников (0 — блоба нет)."""
+        try:
+            return os.stat(self.blob_path(digest)).st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def _write_blob(self, src: str, digest: str) -> str:
+        """Копирует src в блоб digest через временный файл, сверяя хэш на лету."""
+        blob = self.blob_path(digest)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(blob), prefix=".upload-")
+        try:
+            h = hashlib.sha256()
+            with open(src, "rb") as f, os.fdopen(fd, "wb") as out:
+                for chunk in _chunks(f):
+                    h.update(chunk)
+                    out.write(chunk)
+            if h.hexdigest() != digest:
+                raise OSError(f"Файл {src} изменился во время загрузки")
+            os.chmod(tmp, READ_ONLY)
+            if os.path.exists(blob):
+                # Тот же документ успели загрузить параллельно
+                _remove(tmp)
+            else:
+                os.replace(tmp, blob)
+        except BaseException:
+            if os.path.exists(tmp):
+                _remove(tmp)
+            raise
+        return blob
+
+    def add(self, emp_id: int, src: str, filename: Optional[str] = None) -> StoredDocument:
+        """
+        Загружает файл src сотруднику emp_id под именем filename (по умолчанию —
+        имя src). FileExistsError, если у сотрудника уже есть документ с таким именем.
+        """
+        dest = os.path.join(self.employee_dir(emp_id), filename or os.path.basename(src))
+        if os.path.exists(dest):
+            raise FileExistsError(dest)
+        digest = file_digest(src)
+        blob = self.blob_path(digest)
+        deduplicated = os.path.exists(blob)
+        if not deduplicated:
+            self._write_blob(src, digest)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        try:
+            os.link(blob, dest)
+        except OSError as e:
+            # FAT, сетевые папки без жёстких ссылок — обычная копия
+            logger.warning(f"Жёсткая ссылка на {blob} не создана ({e}), документ скопирован")
+            with open(blob, "rb") as f, open(dest, "wb") as out:
+                for chunk in _chunks(f):
+                    out.write(chunk)
+            self._release(blob)
+            deduplicated = False
+        return StoredDocument(dest, digest, os.path.getsize(dest), deduplicated)
+
+    def _release(self, blob: str):
+        """Удаляет блоб, если на него не осталось ссылок."""
+        try:
+            if os.stat(blob).st_nlink <= 1:
+                _remove(blob)
+        except FileNotFoundError:
+            pass
+
+    def remove(self, path: str, digest: Optional[str] = None):
+        """
+        Удаляет документ по пути в папке сотрудника; блоб — вместе с последней
+        ссылкой. digest (если известен) избавляет от повторного хэширования файла.
+        """
+        st = os.stat(path)
+        blob = None
+        if st.st_nlink > 1:
+            blob = self._blob_of(path, st, digest)
+        _remove(path)
+        if blob is not None:
+            self._release(blob)
+
+    def _blob_of(self, path: str, st: os.stat_result, digest: Optional[str] = None) -> Optional[str]:
+        """Блоб, на который ссылается документ: ищется по хэшу, проверяется по inode."""
+        blob = self.blob_path(digest or file_digest(path))
+        try:
+            return blob if os.path.samestat(os.stat(blob), st) else None
+        except FileNotFoundError:
+            return None
+
+    def remove_employee(self, emp_id: int) -> int:
+        """Удаляет все документы сотрудника и его папку; возвращает число документов."""
+        emp_dir = self.employee_dir(emp_id)
+        if not os.path.isdir(emp_dir):
+            return 0
+        removed = 0
+        for entry in os.scandir(emp_dir):
+            if entry.is_file():
+                self.remove(entry.path)
+                removed += 1
+        try:
+            os.rmdir(emp_dir)
+        except OSError as e:
+            logger.warning(f"Папка документов {emp_dir} не удалена: {e}")
+        return removed
+
+    def remove_employees(self, emp_ids, digests) -> int:
+        """
+        Удаляет документы и папки нескольких сотрудников. Ссылки удаляются
+        без хэширования; затем освобождаются только блобы digests (хэши
+        документов из индекса, controllers.BatchDelete.digests). Блобы
+        неиндексированных файлов остаются до collect_garbage (--gc).
+        Возвращает число удалённых документов.
+        """
+        removed = 0
+        for emp_id in emp_ids:
+            emp_dir = self.employee_dir(emp_id)
+            if not os.path.isdir(emp_dir):
+                continue
+            for entry in os.scandir(emp_dir):
+                if entry.is_file():
+                    _remove(entry.path)
+                    removed += 1
+            try:
+                os.rmdir(emp_dir)
+            except OSError as e:
+                logger.warning(f"Папка документов {emp_dir} не удалена: {e}")
+        for digest in digests:
+            self._release(self.blob_path(digest))
+        return removed
+
+    def documents(self, emp_id: int) -> List[str]:
+        """Пути документов сотрудника."""
+        emp_dir = self.employee_dir(emp_id)
+        if not os.path.isdir(emp_dir):
+            return []
+        return [entry.path for entry in os.scandir(emp_dir) if entry.is_file()]
+
+    def dedupe(self) -> DedupeReport:
+        """
+        Переводит документы, загруженные до появления блобов (обычные файлы
+        в папках сотрудников), на жёсткие ссылки. Одинаковые файлы после
+        этого занимают место один раз.
+        """
+        files = linked = saved = 0
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or entry.name == BLOBS_DIRNAME:
+                continue
+            for doc in os.scandir(entry.path):
+                if not doc.is_file():
+                    continue
+                files += 1
+                st = doc.stat()
+                if st.st_nlink > 1:
+                    continue
+                digest = file_digest(doc.path)
+                blob = self.blob_path(digest)
+                if os.path.exists(blob):
+                    saved += st.st_size
+                else:
+                    self._write_blob(doc.path, digest)
+                # Ссылка создаётся рядом и атомарно заменяет документ
+                tmp = doc.path + ".link"
+                os.link(blob, tmp)
+                os.replace(tmp, doc.path)
+                linked += 1
+        return DedupeReport(files, linked, saved)
+
+    def collect_garbage(self) -> int:
+        """Удаляет блобы без ссылок (например, после ручной чистки папок); возвращает их число."""
+        if not os.path.isdir(self.blobs_dir):
+            return 0
+        removed = 0
+        for bucket in os.scandir(self.blobs_dir):
+            if not bucket.is_dir():
+                continue
+            for blob in os.scandir(bucket.path):
+                if blob.is_file() and blob.stat().st_nlink <= 1:
+                    _remove(blob.path)
+                    removed += 1
+        return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Хранилище документов сотрудников")
+    parser.add_argument("--root", default=DOCUMENTS_ROOT, help="папка документов")
+    parser.add_argument("--dedupe", action="store_true", help="перевести документы на общие блобы")
+    parser.add_argument("--gc", action="store_true", help="удалить блобы без ссылок")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    store = DocumentStore(args.root)
+    if args.dedupe:
+        report = store.dedupe()
+        print(
+            f"Документов: {report.files}, переведено на блобы: {report.linked}, "
+            f"освобождено: {report.saved_bytes / 1024 / 1024:.1f} МБ"
+        )
+    if args.gc:
+        print(f"Удалено блобов без ссылок: {store.collect_garbage()}")
+
+if __name__ == "__main__":
+    main()
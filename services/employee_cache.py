@@ -0,0 +1,206 @@
+# services/employee_cache.py
+"""
+Кэш чтений EmployeeService: сотрудники по ID (и ID сотрудника по ID
+пользователя) и списки ID результатов поиска по нормализованной строке запроса.
+
+Оба кэша ограничены по числу записей (вытесняется давно не читанная)
+и по времени жизни записи (TTL) — на случай записи в БД в обход шины
+событий. Инвалидация точная:
+- изменение сотрудника сбрасывает только его запись, а списки поиска —
+  лишь если изменились поля, по которым ищут (SEARCH_FIELDS);
+- удаление убирает сотрудника из записи и из закэшированных списков;
+- создание сбрасывает списки поиска (новый сотрудник может попасть в любой);
+- EMPLOYEES_RELOAD (импорт, изменения из других процессов) — сбрасывает всё.
+EmployeeService инвалидирует кэш сам после своих записей; attach()
+подписывает кэш на шину (events.bus), чтобы учитывать и записи из других
+окон и процессов.
+
+Счётчики попаданий и промахов — stats() / log_stats(); приложение пишет
+их в лог при выходе. Отключить общий кэш: HR_EMPLOYEE_CACHE=0.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional
+
+from events import bus, EMPLOYEE_CREATED, EMPLOYEE_UPDATED, EMPLOYEE_DELETED, EMPLOYEES_RELOAD
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EMPLOYEES = 2000
+DEFAULT_MAX_SEARCHES = 200
+DEFAULT_TTL = 60.0  # с
+
+# Поля, по которым ищет controllers._filter_employees и FTS-индекс
+SEARCH_FIELDS = {"username", "first_name", "last_name"}
+
+CACHE_ENV = "HR_EMPLOYEE_CACHE"
+
+class CacheStats(NamedTuple):
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+class LRUCache:
+    """Словарь с вытеснением давно не читанных записей и временем жизни записи."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires = entry
+            if expires <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, self._clock() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+
+    def update_values(self, fn: Callable):
+        """Заменяет каждое значение на fn(value), не меняя порядок и срок жизни."""
+        with self._lock:
+            for key, (value, expires) in self._data.items():
+                self._data[key] = (fn(value), expires)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                len(self._data), self.hits, self.misses,
+                self.evictions, self.expirations, self.invalidations,
+            )
+
+def normalize_search(search: str) -> str:
+    """Ключ запроса: без лишних пробелов и регистра (поиск к ним нечувствителен)."""
+    return " ".join(search.split()).casefold()
+
+class EmployeeCache:
+    def __init__(
+        self,
+        max_employees: int = DEFAULT_MAX_EMPLOYEES,
+        max_searches: int = DEFAULT_MAX_SEARCHES,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        # ID → отсоединённый Employee с загруженным User
+        self.employees = LRUCache(max_employees, ttl, clock)
+        # ID пользователя → ID сотрудника (связь не меняется, сбрасывается вместе со всем)
+        self.users = LRUCache(max_employees, ttl, clock)
+        # нормализованный поиск → список ID в порядке выдачи
+        self.searches = LRUCache(max_searches, ttl, clock)
+        self._bus = None
+
+    def attach(self, event_bus):
+        """Инвалидировать кэш по событиям шины event_bus."""
+        self.detach()
+        event_bus.subscribe(self.on_event)
+        self._bus = event_bus
+
+    def detach(self):
+        if self._bus is not None:
+            self._bus.unsubscribe(self.on_event)
+            self._bus = None
+
+    def employee_created(self):
+        self.searches.clear()
+
+    def employee_updated(self, emp_id: int, fields=None):
+        """fields — изменённые поля; None — неизвестно какие."""
+        self.employees.pop(emp_id)
+        if fields is None or SEARCH_FIELDS.intersection(fields):
+            self.searches.clear()
+
+    def employee_deleted(self, emp_id: int):
+        self.employees.pop(emp_id)
+        self.searches.update_values(
+            lambda ids: ids if emp_id not in ids else [i for i in ids if i != emp_id]
+        )
+
+    def clear(self):
+        self.employees.clear()
+        self.users.clear()
+        self.searches.clear()
+
+    def on_event(self, event):
+        if event.kind == EMPLOYEE_CREATED:
+            self.employee_created()
+        elif event.kind == EMPLOYEE_UPDATED:
+            self.employee_updated(event.emp_id, event.fields)
+        elif event.kind == EMPLOYEE_DELETED:
+            self.employee_deleted(event.emp_id)
+        elif event.kind == EMPLOYEES_RELOAD:
+            self.clear()
+
+    def stats(self) -> Dict[str, CacheStats]:
+        return {
+            "employees": self.employees.stats(),
+            "users": self.users.stats(),
+            "searches": self.searches.stats(),
+        }
+
+    def log_stats(self):
+        for name, s in self.stats().items():
+            logger.info(
+                f"Кэш {name}: {s.size} записей, попаданий {s.hits}, промахов {s.misses} "
+                f"({s.hit_rate:.0%}), вытеснено {s.evictions}, устарело {s.expirations}, "
+                f"сброшено {s.invalidations}"
+            )
+
+_shared: Optional[EmployeeCache] = None
+_shared_lock = threading.Lock()
+
+def shared_cache() -> Optional[EmployeeCache]:
+    """Общий кэш процесса, подписанный на events.bus (None, если отключён HR_EMPLOYEE_CACHE=0)."""
+    global _shared
+    if os.environ.get(CACHE_ENV, "1") == "0":
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = EmployeeCache()
+            _shared.attach(bus)
+        return _shared
+
+def log_shared_stats():
+    """Записать в лог счётчики общего кэша, если он использовался."""
+    if _shared is not None:
+        _shared.log_stats()
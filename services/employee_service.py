@@ -1,37 +1,170 @@
 # services/employee_service.py
 
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from controllers import (
+    DEFAULT_PAGE_SIZE,
+    EmployeePage,
+    EmployeeSort,
+    EmployeeFilter,
     list_employees as ctrl_list,
+    list_employees_page as ctrl_list_page,
+    list_employee_rows_page as ctrl_list_rows_page,
     get_employee as ctrl_get,
+    get_employee_by_user as ctrl_get_by_user,
     create_employee as ctrl_create,
     update_employee as ctrl_update,
     delete_employee as ctrl_delete,
+    update_employees as ctrl_update_many,
+    delete_employees as ctrl_delete_many,
+    BATCH_EVENT_LIMIT,
+    BatchDelete,
 )
 from models import Employee
+from services.employee_cache import EmployeeCache, normalize_search, shared_cache
+
+# Значение по умолчанию для cache: общий кэш процесса (services.employee_cache)
+SHARED_CACHE = object()
 
 class EmployeeService:
-    def __init__(self, db: Session):
+    """
+    Операции с сотрудниками. get() и list() читают через кэш
+    (services.employee_cache): по умолчанию общий для процесса,
+    cache=None — без кэша. Из кэша возвращаются объекты, отсоединённые
+    от сессии, с загруженным User: их можно читать, но не менять.
+    """
+    def __init__(self, db: Session, cache=SHARED_CACHE):
         self.db = db
+        self.cache: Optional[EmployeeCache] = shared_cache() if cache is SHARED_CACHE else cache
+
+    def _detach(self, emp: Employee) -> Employee:
+        if emp.user is not None:
+            self.db.expunge(emp.user)
+        self.db.expunge(emp)
+        return emp
 
     def list(self, search: str = "") -> List[Employee]:
         """Вернуть список сотрудников с учётом фильтра."""
-        return ctrl_list(self.db, search)
+        if self.cache is None:
+            return ctrl_list(self.db, search)
+        key = normalize_search(search)
+        ids = self.cache.searches.get(key)
+        if ids is None:
+            emps = [self._detach(e) for e in ctrl_list(self.db, key)]
+            for emp in emps:
+                self.cache.employees.put(emp.id, emp)
+            self.cache.searches.put(key, [emp.id for emp in emps])
+            return emps
+        found = {}
+        missing = []
+        for emp_id in ids:
+            emp = self.cache.employees.get(emp_id)
+            if emp is None:
+                missing.append(emp_id)
+            else:
+                found[emp_id] = emp
+        if missing:
+            # Вытесненных из кэша сотрудников — одним запросом
+            loaded = (
+                self.db.query(Employee)
+                .options(selectinload(Employee.user))
+                .filter(Employee.id.in_(missing))
+                .all()
+            )
+            for emp in loaded:
+                found[emp.id] = self._detach(emp)
+                self.cache.employees.put(emp.id, emp)
+        return [found[emp_id] for emp_id in ids if emp_id in found]
+
+    def list_page(
+        self,
+        search: str = "",
+        after_id: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> EmployeePage:
+        """Вернуть страницу сотрудников после курсора after_id."""
+        return ctrl_list_page(self.db, search, after_id, page_size)
+
+    def list_rows_page(
+        self,
+        search: str = "",
+        after_id=None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        sort: Optional[EmployeeSort] = None,
+        flt: Optional[EmployeeFilter] = None,
+    ) -> EmployeePage:
+        """Вернуть страницу лёгких строк для таблицы (только отображаемые колонки)."""
+        return ctrl_list_rows_page(self.db, search, after_id, page_size, sort, flt)
 
     def get(self, emp_id: int) -> Optional[Employee]:
         """Вернуть одного сотрудника."""
-        return ctrl_get(self.db, emp_id)
+        if self.cache is None:
+            return ctrl_get(self.db, emp_id)
+        emp = self.cache.employees.get(emp_id)
+        if emp is None:
+            emp = ctrl_get(self.db, emp_id)
+            if emp is not None:
+                self.cache.employees.put(emp_id, self._detach(emp))
+                self.cache.users.put(emp.user_id, emp_id)
+        return emp
+
+    def get_by_user(self, user_id: int) -> Optional[Employee]:
+        """Вернуть сотрудника пользователя user_id."""
+        if self.cache is None:
+            return ctrl_get_by_user(self.db, user_id)
+        emp_id = self.cache.users.get(user_id)
+        if emp_id is not None:
+            emp = self.get(emp_id)
+            if emp is not None:
+                return emp
+        emp = ctrl_get_by_user(self.db, user_id)
+        if emp is not None:
+            self.cache.employees.put(emp.id, self._detach(emp))
+            self.cache.users.put(user_id, emp.id)
+        return emp
 
     def create(self, username: str, password: str, **data) -> Employee:
         """Создать сотрудника."""
-        return ctrl_create(self.db, username, password, **data)
+        emp = ctrl_create(self.db, username, password, **data)
+        if self.cache is not None:
+            self.cache.employee_created()
+        return emp
 
     def update(self, emp_id: int, **data) -> None:
         """Обновить сотрудника."""
         ctrl_update(self.db, emp_id, **data)
+        if self.cache is not None:
+            self.cache.employee_updated(emp_id, data.keys())
 
     def delete(self, emp_id: int) -> None:
         """Удалить сотрудника."""
         ctrl_delete(self.db, emp_id)
+        if self.cache is not None:
+            self.cache.employee_deleted(emp_id)
+
+    def update_many(self, ids, **data) -> int:
+        """Присвоить поля data всем сотрудникам ids (один UPDATE)."""
+        updated = ctrl_update_many(self.db, ids, **data)
+        if self.cache is not None:
+            self._forget(ids, data.keys())
+        return updated
+
+    def delete_many(self, ids) -> BatchDelete:
+        """Удалить сотрудников ids; возвращает ID удалённых и хэши их документов."""
+        deleted = ctrl_delete_many(self.db, ids)
+        if self.cache is not None:
+            if len(deleted.ids) > BATCH_EVENT_LIMIT:
+                self.cache.clear()
+            else:
+                for emp_id in deleted.ids:
+                    self.cache.employee_deleted(emp_id)
+        return deleted
+
+    def _forget(self, ids, fields):
+        ids = set(ids)
+        if len(ids) > BATCH_EVENT_LIMIT:
+            self.cache.clear()
+            return
+        for emp_id in ids:
+            self.cache.employee_updated(emp_id, fields)
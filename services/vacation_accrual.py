@@ -0,0 +1,189 @@
+# services/vacation_accrual.py
+"""
+Ежегодное начисление отпуска по стажу (hire_date) и правилам AccrualPolicy:
+accrue() — один UPDATE по всей таблице в одной транзакции, plan() — тот же
+расчёт без записи. Год начисления хранится в vacation_accrued_year,
+повторный запуск за тот же год ничего не меняет.
+
+    python -m services.vacation_accrual --year 2026 [--dry-run] [--policy capped]
+"""
+
+import argparse
+import logging
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Integer, and_, case, cast, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from events import bus, EmployeeEvent, EMPLOYEES_RELOAD
+from models import Employee
+
+logger = logging.getLogger(__name__)
+
+class AccrualPolicy(NamedTuple):
+    """Правила начисления отпуска."""
+    name: str
+    # Основной ежегодный отпуск, дн.
+    base_days: int = 28
+    # (полных лет стажа, дней надбавки) — действует наибольшая достигнутая ступень
+    seniority_bonus: Tuple[Tuple[int, int], ...] = ()
+    # Сколько дней прошлого остатка переносится (None — весь остаток)
+    carry_over_cap: Optional[int] = None
+    # Принятым в году начисления — пропорционально оставшимся месяцам
+    prorate_first_year: bool = True
+
+POLICIES: Dict[str, AccrualPolicy] = {
+    policy.name: policy for policy in (
+        AccrualPolicy("standard", 28, ((5, 2), (10, 4))),
+        AccrualPolicy("capped", 28, ((5, 2), (10, 4)), carry_over_cap=28),
+        AccrualPolicy("basic", 28),
+    )
+}
+DEFAULT_POLICY = "standard"
+
+class AccrualDiff(NamedTuple):
+    emp_id: int
+    old: Optional[int]
+    new: int
+
+    @property
+    def delta(self) -> int:
+        return self.new - (self.old or 0)
+
+class AccrualPlan(NamedTuple):
+    """Результат начисления (или пробного прогона) за год year."""
+    year: int
+    policy: str
+    affected: int
+    added_days: int
+    diffs: List[AccrualDiff]
+
+def _hire_year():
+    return cast(func.strftime("%Y", Employee.hire_date), Integer)
+
+def _hire_month():
+    return cast(func.strftime("%m", Employee.hire_date), Integer)
+
+def new_balance(policy: AccrualPolicy, year: int):
+    """
+    SQL-выражение нового остатка отпуска за год year:
+    min(остаток, carry_over_cap) + base_days + надбавка за стаж. Стаж — полных
+    лет к концу года (year − год приёма); принятым в году year base_days
+    начисляется за оставшиеся месяцы, считая месяц приёма.
+    """
+    service = year - _hire_year()
+    bonus = case(
+        *[
+            (service >= years, days)
+            for years, days in sorted(policy.seniority_bonus, reverse=True)
+        ],
+        else_=0,
+    ) if policy.seniority_bonus else 0
+    base = policy.base_days
+    if policy.prorate_first_year:
+        base = case(
+            (
+                _hire_year() == year,
+                cast(func.round(policy.base_days * (13 - _hire_month()) / 12.0), Integer),
+            ),
+            else_=policy.base_days,
+        )
+    carried = func.coalesce(Employee.vacation_days_left, 0)
+    if policy.carry_over_cap is not None:
+        # min() с двумя аргументами в SQLite — скалярный минимум
+        carried = func.min(carried, policy.carry_over_cap)
+    return carried + base + bonus
+
+def _due(year: int):
+    """Кому положено начисление за year и кто его ещё не получил."""
+    return and_(
+        Employee.hire_date.isnot(None),
+        _hire_year() <= year,
+        or_(Employee.vacation_accrued_year.is_(None), Employee.vacation_accrued_year < year),
+    )
+
+def _policy(policy) -> AccrualPolicy:
+    if isinstance(policy, AccrualPolicy):
+        return policy
+    try:
+        return POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unknown accrual policy: {policy}") from None
+
+def plan(db: Session, year: Optional[int] = None, policy=DEFAULT_POLICY) -> AccrualPlan:
+    """Пробный прогон: что изменит accrue(), без записи в БД."""
+    year = year or date.today().year
+    policy = _policy(policy)
+    rows = db.execute(
+        select(Employee.id, Employee.vacation_days_left, new_balance(policy, year))
+        .where(_due(year))
+        .order_by(Employee.id)
+    ).all()
+    diffs = [AccrualDiff(*row) for row in rows]
+    return AccrualPlan(year, policy.name, len(diffs), sum(d.delta for d in diffs), diffs)
+
+def accrue(db: Session, year: Optional[int] = None, policy=DEFAULT_POLICY) -> AccrualPlan:
+    """
+    Начисляет отпуск за year одним UPDATE в одной транзакции.
+    diffs в результате пустой: изменения до записи — plan().
+    """
+    year = year or date.today().year
+    policy = _policy(policy)
+    try:
+        added = db.execute(
+            select(func.coalesce(func.sum(
+                new_balance(policy, year) - func.coalesce(Employee.vacation_days_left, 0)
+            ), 0)).where(_due(year))
+        ).scalar_one()
+        result = db.execute(
+            update(Employee)
+            .where(_due(year))
+            .values(
+                vacation_days_left=new_balance(policy, year),
+                vacation_accrued_year=year,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Ошибка начисления отпуска за {year}: {e}")
+        raise
+    # UPDATE мимо ORM: загруженные в сессию объекты устарели
+    db.expire_all()
+    affected = result.rowcount
+    logger.info(
+        f"Начислен отпуск за {year} (правила {policy.name}): "
+        f"{affected} сотрудников, всего {added} дн."
+    )
+    if affected:
+        bus.publish(EmployeeEvent(EMPLOYEES_RELOAD, None, {"vacation_accrued": affected}))
+    return AccrualPlan(year, policy.name, affected, added, [])
+
+def main():
+    from database import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(description="Ежегодное начисление отпуска")
+    parser.add_argument("--year", type=int, default=date.today().year, help="год начисления")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default=DEFAULT_POLICY)
+    parser.add_argument("--dry-run", action="store_true", help="показать изменения без записи")
+    parser.add_argument("--show", type=int, default=20, help="сколько изменений вывести при --dry-run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    init_db()
+    with SessionLocal() as db:
+        if args.dry_run:
+            result = plan(db, args.year, args.policy)
+            for diff in result.diffs[:args.show]:
+                print(f"{diff.emp_id:>8}  {diff.old if diff.old is not None else '—':>5} → {diff.new:<5} (+{diff.delta})")
+            if result.affected > args.show:
+                print(f"… и ещё {result.affected - args.show}")
+        else:
+            result = accrue(db, args.year, args.policy)
+    print(f"Год {result.year}, правила {result.policy}: сотрудников {result.affected}, дней {result.added_days}")
+
+if __name__ == "__main__":
+    main()
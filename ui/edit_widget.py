@@ -8,13 +8,14 @@ from PyQt5.QtCore import QDate, Qt
 from sqlalchemy.exc import SQLAlchemyError
 from database import SessionLocal
 from controllers import get_employee, update_employee
+from validation import PASSPORT_REGEX
 from ui.form_base import EmployeeFormDialog
 from main import DATE_FORMAT
 
 logger = logging.getLogger(__name__)
 
 class EditWidget(EmployeeFormDialog):
-    def __init__(self, emp_id, parent=None):
+    def __init__(self, emp_id, parent=None, emp=None):
         super().__init__("Редактировать сотрудника", parent)
         self.emp_id = emp_id
 
@@ -22,10 +23,11 @@ class EditWidget(EmployeeFormDialog):
         self.setSizeGripEnabled(True)
         self.resize(500, 700)
 
-        # Загрузка данных из БД
+        # Загрузка данных из БД (если вызывающее окно не передало сотрудника)
         try:
-            with SessionLocal() as db:
-                emp = get_employee(db, emp_id)
+            if emp is None:
+                with SessionLocal() as db:
+                    emp = get_employee(db, emp_id)
         except SQLAlchemyError as e:
             logger.error(f"Ошибка БД при загрузке сотрудника: {e}")
             self.show_error("Ошибка", "Не удалось загрузить данные сотрудника")
@@ -83,7 +85,7 @@ class EditWidget(EmployeeFormDialog):
         ])
         self.apply_phone_validator([self.mobile, self.work])
         # Валидатор паспорта: 4 цифры, опционально пробел, 6 цифр
-        self.apply_regex_validator([self.passport], r'^\d{4}\s?\d{6}$')
+        self.apply_regex_validator([self.passport], PASSPORT_REGEX)
 
         # Сборка формы
         fields = [
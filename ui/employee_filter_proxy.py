@@ -0,0 +1,82 @@
+# ui/employee_filter_proxy.py
+
+from PyQt5.QtCore import Qt, QSortFilterProxyModel, pyqtSignal
+
+from controllers import EmployeeFilter, NO_FILTER
+
+class EmployeeFilterProxyModel(QSortFilterProxyModel):
+    """
+    Сортировка и фильтры (controllers.EmployeeFilter) поверх EmployeeTableModel.
+    Сравнение строк идёт по ключам DisplayRow.keys, вычисленным при загрузке,
+    а не по отображаемому тексту, поэтому даты и числа сортируются верно.
+
+    Пока загруженные строки заведомо полны, сортировка и фильтры работают
+    в памяти. Если же загружена только часть строк (или строки уже выбраны
+    с другим фильтром), в памяти правильный результат не получить — прокси
+    испускает sql_reload_requested, и владелец перезапрашивает первую
+    страницу с тем же порядком и фильтром в SQL.
+    """
+    sql_reload_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filter = NO_FILTER
+        self.setDynamicSortFilter(True)
+
+    def current_filter(self) -> EmployeeFilter:
+        return self._filter
+
+    def set_filter(self, flt: EmployeeFilter):
+        if flt == self._filter:
+            return
+        self._filter = flt
+        self.invalidateFilter()
+        source = self.sourceModel()
+        if source is not None and (
+            source.canFetchMore() or source.loaded_filter not in (NO_FILTER, flt)
+        ):
+            self.sql_reload_requested.emit()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        flt = self._filter
+        if flt == NO_FILTER:
+            return True
+        row = self.sourceModel().display_row(source_row)
+        if flt.position and row.values[3] != flt.position:
+            return False
+        if flt.hired_from is not None or flt.hired_to is not None:
+            if row.hire_date is None:
+                return False
+            if flt.hired_from is not None and row.hire_date < flt.hired_from:
+                return False
+            if flt.hired_to is not None and row.hire_date > flt.hired_to:
+                return False
+        if flt.min_vacation_days is not None:
+            days = row.values[5]
+            if days is None or days < flt.min_vacation_days:
+                return False
+        return True
+
+    def lessThan(self, left, right):
+        source = self.sourceModel()
+        column = left.column()
+        return (
+            source.display_row(left.row()).sort_key(column)
+            < source.display_row(right.row()).sort_key(column)
+        )
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        source = self.sourceModel()
+        descending = order == Qt.DescendingOrder
+        reload = (
+            column >= 0 and source is not None and source.canFetchMore()
+            and (source.sort_column, source.sort_descending) != (column, descending)
+        )
+        # Сначала запоминаем новый порядок: владелец читает его из sortColumn()/sortOrder()
+        super().sort(column, order)
+        if reload:
+            self.sql_reload_requested.emit()
+
+    def employee_id(self, row: int) -> int:
+        """ID сотрудника в строке row представления."""
+        return self.sourceModel().employee_id(self.mapToSource(self.index(row, 0)).row())
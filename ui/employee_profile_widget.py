@@ -2,33 +2,50 @@
 
 import logging
 import os
-import shutil
 import subprocess
 from PyQt5.QtWidgets import (
     QWidget, QFormLayout, QLabel, QVBoxLayout, QGroupBox,
     QMessageBox, QPushButton, QFileDialog, QHBoxLayout,
     QListWidget, QListWidgetItem
 )
-from PyQt5.QtGui import QFont, QPixmap, QIcon
+from PyQt5.QtGui import QFont, QIcon
 from PyQt5.QtCore import Qt
 from sqlalchemy.exc import SQLAlchemyError
 
-from database import SessionLocal
-from controllers import get_employee_by_user
+from events import EMPLOYEE_UPDATED, EMPLOYEE_DELETED, EMPLOYEES_RELOAD
 from ui.utils import icon, icon_label
+from ui.event_bridge import employee_events
+from ui.session_scope import WindowSession
+from ui.photos import PROFILE_THUMB_SIZE, ingest_photo, photo_pixmap
 
 logger = logging.getLogger(__name__)
 
-# Директории для хранения файлов
-PROFILE_PHOTOS_DIR = "profile_photos/"
+# Директория документов (фото — ui.photos.PROFILE_PHOTOS_DIR)
 EMPLOYEE_DOCS_DIR  = "employee_docs/"
 
+def document_store():
+    """Хранилище документов (services.document_store) в EMPLOYEE_DOCS_DIR."""
+    from services.document_store import DocumentStore
+    return DocumentStore(EMPLOYEE_DOCS_DIR)
+
+def document_service(db):
+    """Документы сотрудников (файлы и индекс) в EMPLOYEE_DOCS_DIR."""
+    from services.document_service import DocumentService
+    return DocumentService(db, document_store())
+
+# Роль элемента списка документов с id строки в таблице documents
+DOCUMENT_ID_ROLE = Qt.UserRole + 1
+
 class EmployeeProfileWidget(QWidget):
-    def __init__(self, user, on_logout, show_logout=True):
+    def __init__(self, user, on_logout, show_logout=True, current_user=None, emp=None):
         super().__init__()
         self.user = user
+        # Кто работает с карточкой (HR открывает чужие): автор загрузок документов
+        self.current_user = current_user or user
         self.on_logout = on_logout
         self.show_logout = show_logout
+        # Сессии действий карточки и кэш сотрудника
+        self.session = WindowSession(self)
 
         self.setWindowTitle("Моя карточка")
         self.setMinimumSize(400, 650)
@@ -38,10 +55,9 @@ class EmployeeProfileWidget(QWidget):
         main_layout.setContentsMargins(24, 24, 24, 24)
         main_layout.setSpacing(16)
 
-        # Загрузка данных о сотруднике
+        # Сотрудник, уже загруженный вызывающим окном, не перечитывается
         try:
-            with SessionLocal() as db:
-                self.emp = get_employee_by_user(db, user.id)
+            self.emp = emp if emp is not None else self.session.employee_by_user(user.id)
         except SQLAlchemyError as e:
             logger.error(f"Ошибка БД при загрузке профиля: {e}")
             QMessageBox.critical(self, "Ошибка", "Не удалось получить данные из БД.")
@@ -74,24 +90,13 @@ class EmployeeProfileWidget(QWidget):
         info_box.setLayout(info_layout)
         main_layout.addWidget(info_box)
 
-        date_str = self.emp.hire_date.strftime("%d.%m.%Y") if self.emp.hire_date else ""
-        fields = [
-            ("ID", self.emp.id),
-            ("Логин", self.emp.user.username),
-            ("ФИО", f"{self.emp.first_name} {self.emp.last_name}"),
-            ("Паспорт", self.emp.passport),
-            ("Год рождения", self.emp.birth_year),
-            ("Стаж (лет)", self.emp.experience_years),
-            ("Дата приёма", date_str),
-            ("Телефон (моб.)", self.emp.phone_mobile),
-            ("Телефон (раб.)", self.emp.phone_work),
-            ("Остаток отпускных", self.emp.vacation_days_left),
-        ]
-        for label_text, value in fields:
-            info_layout.addRow(
-                icon_label('id-badge', 20),
-                QLabel(f"<b>{label_text}:</b> {value}")
-            )
+        # Подписи полей сохраняются, чтобы события шины обновляли их на месте
+        self.info_labels = []
+        for _ in range(len(self._info_fields())):
+            label = QLabel()
+            self.info_labels.append(label)
+            info_layout.addRow(icon_label('id-badge', 20), label)
+        self._render_info()
 
         # Раздел документов
         docs_box = QGroupBox("Документы сотрудника")
@@ -124,10 +129,59 @@ class EmployeeProfileWidget(QWidget):
         # Загрузка списка документов
         self.load_documents()
 
+        # Изменения этого сотрудника в других окнах и процессах
+        employee_events().changed.connect(self._on_employee_event)
+
+    def _info_fields(self):
+        date_str = self.emp.hire_date.strftime("%d.%m.%Y") if self.emp.hire_date else ""
+        return [
+            ("ID", self.emp.id),
+            ("Логин", self.emp.user.username),
+            ("ФИО", f"{self.emp.first_name} {self.emp.last_name}"),
+            ("Паспорт", self.emp.passport),
+            ("Год рождения", self.emp.birth_year),
+            ("Стаж (лет)", self.emp.experience_years),
+            ("Дата приёма", date_str),
+            ("Телефон (моб.)", self.emp.phone_mobile),
+            ("Телефон (раб.)", self.emp.phone_work),
+            ("Остаток отпускных", self.emp.vacation_days_left),
+        ]
+
+    def _render_info(self):
+        for label, (label_text, value) in zip(self.info_labels, self._info_fields()):
+            label.setText(f"<b>{label_text}:</b> {value}")
+
+    def _on_employee_event(self, event):
+        if event.kind == EMPLOYEES_RELOAD:
+            self._reload_employee()
+        elif event.emp_id != self.emp.id:
+            return
+        elif event.kind == EMPLOYEE_UPDATED:
+            # Изменённые поля приходят в событии — БД не перечитывается
+            for name, value in event.fields.items():
+                setattr(self.emp, name, value)
+            self._render_info()
+        elif event.kind == EMPLOYEE_DELETED:
+            self.setEnabled(False)
+            self.setWindowTitle(f"{self.windowTitle()} (сотрудник удалён)")
+
+    def _reload_employee(self):
+        """Перечитать сотрудника после массовых или внешних изменений."""
+        try:
+            emp = self.session.employee_by_user(self.user.id)
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка БД при обновлении профиля: {e}")
+            return
+        if emp is None:
+            self.setEnabled(False)
+            return
+        self.emp = emp
+        self._render_info()
+
     def load_profile_photo(self):
-        path = os.path.join(PROFILE_PHOTOS_DIR, f"{self.emp.id}.jpg")
-        if os.path.exists(path):
-            pixmap = QPixmap(path).scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # Готовая миниатюра PROFILE_THUMB_SIZE, исходное фото не декодируется
+        pixmap = photo_pixmap(self.emp.id, PROFILE_THUMB_SIZE)
+        if pixmap is not None:
             self.photo_label.setPixmap(pixmap)
         else:
             self.photo_label.setText("Нет фото")
@@ -135,41 +189,47 @@ class EmployeeProfileWidget(QWidget):
     def change_photo(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Выберите фото", "", "Images (*.png *.jpg *.jpeg)")
         if file_path:
-            os.makedirs(PROFILE_PHOTOS_DIR, exist_ok=True)
-            dest = os.path.join(PROFILE_PHOTOS_DIR, f"{self.emp.id}.jpg")
             try:
-                shutil.copy(file_path, dest)
+                ingest_photo(file_path, self.emp.id)
                 self.load_profile_photo()
                 QMessageBox.information(self, "Успех", "Фото обновлено.")
             except Exception as e:
-                logger.error(f"Ошибка при копировании фото: {e}")
+                logger.error(f"Ошибка при сохранении фото: {e}")
                 QMessageBox.critical(self, "Ошибка", "Не удалось обновить фото.")
 
     def load_documents(self):
-        """Сканирует папку и отображает список документов"""
+        """Отображает список документов из индекса (таблица documents)"""
         self.docs_list.clear()
-        emp_dir = os.path.join(EMPLOYEE_DOCS_DIR, str(self.emp.id))
-        if not os.path.isdir(emp_dir):
+        try:
+            with self.session.unit() as db:
+                service = document_service(db)
+                docs = [(doc, service.path(doc)) for doc in service.list(self.emp.id)]
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка БД при загрузке списка документов: {e}")
             return
-        for fname in os.listdir(emp_dir):
-            item = QListWidgetItem(QIcon(icon('file')), fname)
-            item.setData(Qt.UserRole, os.path.join(emp_dir, fname))
+        for doc, path in docs:
+            item = QListWidgetItem(QIcon(icon('file')), doc.filename)
+            item.setData(Qt.UserRole, path)
+            item.setData(DOCUMENT_ID_ROLE, doc.id)
+            item.setToolTip(
+                f"{doc.mime}, {doc.size / 1024:.0f} КБ\n"
+                f"Загружен {doc.uploaded_at:%d.%m.%Y %H:%M}"
+            )
             self.docs_list.addItem(item)
 
     def upload_document(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Выберите документ", "", "Документы (*.pdf *.docx *.jpg *.png)")
         if file_path:
-            emp_dir = os.path.join(EMPLOYEE_DOCS_DIR, str(self.emp.id))
-            os.makedirs(emp_dir, exist_ok=True)
             file_name = os.path.basename(file_path)
-            dest_path = os.path.join(emp_dir, file_name)
-            if os.path.exists(dest_path):
-                QMessageBox.warning(self, "Внимание", f"Документ '{file_name}' уже существует.")
-                return
             try:
-                shutil.copy(file_path, dest_path)
+                with self.session.unit() as db:
+                    document_service(db).upload(
+                        self.emp.id, file_path, uploaded_by=self.current_user.id, filename=file_name
+                    )
                 QMessageBox.information(self, "Успех", f"Документ загружен: {file_name}")
                 self.load_documents()
+            except FileExistsError:
+                QMessageBox.warning(self, "Внимание", f"Документ '{file_name}' уже существует.")
             except Exception as e:
                 logger.error(f"Ошибка при загрузке документа: {e}")
                 QMessageBox.critical(self, "Ошибка", "Не удалось загрузить документ.")
@@ -179,7 +239,7 @@ class EmployeeProfileWidget(QWidget):
         if not item:
             QMessageBox.warning(self, "Удаление", "Выберите документ для удаления.")
             return
-        path = item.data(Qt.UserRole)
+        doc_id = item.data(DOCUMENT_ID_ROLE)
         reply = QMessageBox.question(
             self, "Подтверждение удаления",
             f"Удалить документ '{item.text()}'?",
@@ -187,7 +247,8 @@ class EmployeeProfileWidget(QWidget):
         )
         if reply == QMessageBox.Yes:
             try:
-                os.remove(path)
+                with self.session.unit() as db:
+                    document_service(db).delete(doc_id)
                 QMessageBox.information(self, "Успех", "Документ удалён.")
                 self.load_documents()
             except Exception as e:
@@ -0,0 +1,60 @@
+# ui/event_bridge.py
+
+import logging
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from events import bus, DataVersionWatcher
+from services.employee_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Период опроса PRAGMA data_version (изменения из других процессов)
+DATA_VERSION_POLL_MS = 2000
+
+class EmployeeEventBridge(QObject):
+    """
+    Переносит события шины events.bus в GUI-поток.
+    Контроллеры могут публиковать события из фоновых задач;
+    сигнал changed, испущенный в чужом потоке, доставляется виджетам
+    через очередь событий, а в GUI-потоке — сразу.
+    """
+    changed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._watcher = None
+        self._timer = None
+        # Подписчики шины вызываются по порядку подписки, а в GUI-потоке
+        # changed доставляется сразу: общий кэш сотрудников должен сброситься
+        # раньше, чем окна начнут перечитывать данные по событию
+        shared_cache()
+        bus.subscribe(self._forward)
+
+    def _forward(self, event):
+        self.changed.emit(event)
+
+    def watch_database(self, engine, interval_ms: int = DATA_VERSION_POLL_MS):
+        """Включает опрос data_version, чтобы видеть коммиты других процессов."""
+        if self._timer is not None:
+            return
+        self._watcher = DataVersionWatcher(engine)
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._poll)
+        self._timer.start()
+
+    def _poll(self):
+        try:
+            self._watcher.poll()
+        except Exception as e:
+            logger.error(f"Ошибка опроса data_version: {e}")
+
+# Мост создаётся при первом обращении из GUI-потока
+_bridge: EmployeeEventBridge = None
+
+def employee_events() -> EmployeeEventBridge:
+    """Общий для приложения мост событий о сотрудниках."""
+    global _bridge
+    if _bridge is None:
+        _bridge = EmployeeEventBridge()
+    return _bridge
@@ -0,0 +1,93 @@
+# ui/export_jobs.py
+
+import logging
+import os
+import threading
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from database import SessionLocal
+from controllers import EmployeeFilter, NO_FILTER, count_employees, iter_employee_rows, employee_column_widths
+
+logger = logging.getLogger(__name__)
+
+class ExportJobSignals(QObject):
+    """
+    Сигналы задачи экспорта (job_id — номер задачи в панели):
+    progress(job_id, done, total), finished(job_id, rows),
+    failed(job_id, message), cancelled(job_id).
+    """
+    progress = pyqtSignal(int, int, int)
+    finished = pyqtSignal(int, int)
+    failed = pyqtSignal(int, str)
+    cancelled = pyqtSignal(int)
+
+class ExportJob(QRunnable):
+    """
+    Фоновый экспорт отчёта (PDF/XLSX) по строке поиска и фильтрам таблицы.
+    Работает в собственной сессии БД и читает сотрудников страницами;
+    cancel() останавливает выгрузку на ближайшей порции строк,
+    недописанный файл удаляется.
+    """
+    def __init__(self, job_id: int, fmt: str, path: str, search: str, flt: EmployeeFilter = NO_FILTER):
+        super().__init__()
+        self.job_id = job_id
+        self.fmt = fmt
+        self.path = path
+        self.search = search
+        self.flt = flt
+        self.signals = ExportJobSignals()
+        self._cancel = threading.Event()
+        # Объект задачи живёт, пока на него ссылается Python: пул не удалит его
+        # после run(), и tryTake()/cancel() безопасны в любой момент
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _progress(self, total):
+        from reports import ExportCancelled
+
+        def report(done):
+            if self._cancel.is_set():
+                raise ExportCancelled()
+            self.signals.progress.emit(self.job_id, done, total)
+        return report
+
+    def run(self):
+        if self._cancel.is_set():
+            self.signals.cancelled.emit(self.job_id)
+            return
+        # reportlab и openpyxl загружаются при первом экспорте, а не при запуске
+        from reports import ExportCancelled, export_employees_pdf_stream, export_employees_excel_stream
+        try:
+            with SessionLocal() as db:
+                total = count_employees(db, self.search, self.flt)
+                self.signals.progress.emit(self.job_id, 0, total)
+                employees = iter_employee_rows(db, self.search, flt=self.flt)
+                if self.fmt == 'pdf':
+                    rows = export_employees_pdf_stream(
+                        self.path, employees, progress=self._progress(total)
+                    )
+                else:
+                    widths = employee_column_widths(db, self.search, self.flt)
+                    rows = export_employees_excel_stream(
+                        self.path, employees, widths, progress=self._progress(total)
+                    )
+        except ExportCancelled:
+            self._remove_partial()
+            logger.info(f"Экспорт отменён: {self.path}")
+            self.signals.cancelled.emit(self.job_id)
+            return
+        except Exception as e:
+            self._remove_partial()
+            logger.error(f"Error exporting ({self.fmt}): {e}")
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.finished.emit(self.job_id, rows)
+
+    def _remove_partial(self):
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"Не удалось удалить недописанный отчёт {self.path}: {e}")
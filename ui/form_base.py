@@ -7,6 +7,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont, QRegularExpressionValidator
 from PyQt5.QtCore import QRegularExpression
 from ui.utils import icon_label
+from validation import PHONE_REGEX
 
 class EmployeeFormDialog(QDialog):
     def __init__(self, title: str, parent=None):
@@ -57,7 +58,7 @@ class EmployeeFormDialog(QDialog):
         """
         Применить валидатор телефонного номера (+?digits 5-15).
         """
-        pattern = QRegularExpression(r'^\+?\d{5,15}$')
+        pattern = QRegularExpression(PHONE_REGEX)
         val = QRegularExpressionValidator(pattern, self)
         for w in widgets:
             w.setValidator(val)
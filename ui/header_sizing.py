@@ -0,0 +1,110 @@
+# ui/header_sizing.py
+"""
+Ширины колонок таблицы без QHeaderView.ResizeToContents.
+
+ResizeToContents пересчитывает ширины при каждом сбросе и вставке
+строк, опрашивая делегат по строкам каждой колонки, — на большой
+таблице это дороже самого запроса. ContentHeaderSizer считает ширину
+колонки по двум источникам:
+- самому длинному тексту колонки, который модель отслеживает
+  при загрузке строк (longest_texts()), — одно измерение QFontMetrics;
+- первым SAMPLE_ROWS строкам представления через делегат: так учитываются
+  отступы стиля, иконки и то, что в пропорциональном шрифте длинный по
+  символам текст не обязательно самый широкий.
+Пересчёт выполняется, только когда меняется «форма» данных — длины
+самых длинных текстов; очередная страница с короткими значениями
+ширины не трогает. Пересчёты, вызванные несколькими сигналами подряд,
+объединяются в один.
+
+Сравнение с ResizeToContents: bench/bench_header_sizing.py.
+"""
+
+from PyQt5.QtCore import QObject, QTimer
+from PyQt5.QtWidgets import QHeaderView, QStyleOptionViewItem
+
+# Сколько первых строк представления измерять делегатом
+SAMPLE_ROWS = 50
+# Ширина колонки не больше, px (длиннее — текст обрезается многоточием)
+MAX_COLUMN_WIDTH = 480
+
+def _source_with_longest(model):
+    """Модель с longest_texts() под цепочкой прокси (или None)."""
+    while model is not None and not hasattr(model, "longest_texts"):
+        model = model.sourceModel() if hasattr(model, "sourceModel") else None
+    return model
+
+class ContentHeaderSizer(QObject):
+    """
+    Подбирает ширины колонок view (Interactive, их можно менять мышью)
+    по самым длинным текстам модели и выборке строк.
+    """
+    def __init__(self, view, sample_rows: int = SAMPLE_ROWS, max_width: int = MAX_COLUMN_WIDTH):
+        super().__init__(view)
+        self.view = view
+        self.sample_rows = sample_rows
+        self.max_width = max_width
+        self._signature = None
+        self._pending = QTimer(self)
+        self._pending.setSingleShot(True)
+        self._pending.timeout.connect(self.resize_sections)
+        self._model = None
+        view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.set_model(view.model())
+
+    def set_model(self, model):
+        """Следить за моделью model (вызвать после view.setModel)."""
+        if self._model is not None:
+            for signal in self._signals(self._model):
+                signal.disconnect(self.schedule)
+        self._model = model
+        self._signature = None
+        if model is not None:
+            for signal in self._signals(model):
+                signal.connect(self.schedule)
+            self.schedule()
+
+    @staticmethod
+    def _signals(model):
+        return (model.modelReset, model.rowsInserted, model.dataChanged, model.layoutChanged)
+
+    def schedule(self, *args):
+        """Отложенный пересчёт: сигналы одной пачки дают один пересчёт."""
+        self._pending.start(0)
+
+    def invalidate(self):
+        """Пересчитать ширины при следующем вызове, даже если данные не менялись (смена шрифта)."""
+        self._signature = None
+        self.schedule()
+
+    def resize_sections(self):
+        model = self.view.model()
+        source = _source_with_longest(model)
+        if model is None or source is None:
+            return
+        longest = source.longest_texts()
+        signature = tuple(len(text) for text in longest)
+        if signature == self._signature:
+            return
+        self._signature = signature
+
+        header = self.view.horizontalHeader()
+        metrics = self.view.fontMetrics()
+        delegate = self.view.itemDelegate()
+        option = QStyleOptionViewItem()
+        option.initFrom(self.view)
+        option.font = self.view.font()
+        rows = min(model.rowCount(), self.sample_rows)
+        for column in range(model.columnCount()):
+            if header.isSectionHidden(column):
+                continue
+            width = header.sectionSizeHint(column)
+            # Отступы и иконка — разница между шириной ячейки по делегату и её текста
+            padding = 0
+            for row in range(rows):
+                index = model.index(row, column)
+                hint = delegate.sizeHint(option, index).width()
+                width = max(width, hint)
+                text = index.data()
+                padding = max(padding, hint - metrics.horizontalAdvance("" if text is None else str(text)))
+            width = max(width, metrics.horizontalAdvance(longest[column]) + padding)
+            header.resizeSection(column, min(width, self.max_width))
@@ -2,35 +2,73 @@
 
 import logging
 import os
-import shutil
 import subprocess
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
-    QMessageBox, QTableView, QFrame, QFileDialog, QHeaderView
+    QMessageBox, QTableView, QFrame, QFileDialog,
+    QListWidget, QListWidgetItem, QLabel, QDateEdit, QSpinBox, QComboBox, QInputDialog
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, QThreadPool, QDate
 
 from database import SessionLocal
 from services.employee_service import EmployeeService
-from controllers import get_employee
-from reports import export_employees_pdf, export_employees_excel
+from services.vacation_accrual import DEFAULT_POLICY, accrue, plan
+from controllers import get_employee_row, list_positions, EmployeeSort, EmployeeFilter
 from ui.utils import icon, icon_label, notify_qt
-from ui.models_table import EmployeeTableModel
+from ui.models_table import EmployeeTableModel, SORT_FIELDS
+from ui.employee_filter_proxy import EmployeeFilterProxyModel
+from ui.workers import Worker
+from ui.export_jobs import ExportJob
+from ui.event_bridge import employee_events
+from events import EMPLOYEE_CREATED, EMPLOYEE_UPDATED, EMPLOYEE_DELETED, EMPLOYEES_RELOAD
 from ui.employee_profile_widget import (
     EmployeeProfileWidget,
-    PROFILE_PHOTOS_DIR,
-    EMPLOYEE_DOCS_DIR
+    document_store,
 )
+from ui.photos import avatar_size, remove_photos
+from ui.header_sizing import ContentHeaderSizer
+from ui.session_scope import WindowSession
 
 logger = logging.getLogger(__name__)
 
+# Пауза после последнего нажатия клавиши перед запуском поиска
+SEARCH_DEBOUNCE_MS = 300
+# Сколько показывать завершённую задачу экспорта в панели
+EXPORT_DONE_VISIBLE_MS = 5000
+# Поля сотрудника, которые видны в таблице (и по которым идёт поиск)
+TABLE_FIELDS = {"username", "first_name", "last_name", "position", "hire_date", "vacation_days_left"}
+# Поля, которые можно присвоить сразу нескольким выбранным сотрудникам
+BULK_EDIT_FIELDS = [("Должность", "position"), ("Отпуск (дн.)", "vacation_days_left")]
+# Дата-заглушка «фильтр по дате не задан» в полях диапазона
+NO_DATE = QDate(1900, 1, 1)
+
 class HRDashboardWidget(QWidget):
     def __init__(self, user, on_logout):
         super().__init__()
         self.user = user
         self.on_logout = on_logout
         self.profile_window = None
+        # Сессии действий окна и кэш загруженных сотрудников
+        self.session = WindowSession(self)
+
+        # Поиск выполняется в отдельном потоке: не больше одного запроса
+        # одновременно, ответы на устаревшие запросы отбрасываются
+        self._search_pool = QThreadPool(self)
+        self._search_pool.setMaxThreadCount(1)
+        self._search_generation = 0
+        self._search_jobs = {}  # generation -> Worker, пока задача не завершилась
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self.refresh)
+
+        # Экспорты выполняются в фоне по очереди, по одному за раз
+        self._export_pool = QThreadPool(self)
+        self._export_pool.setMaxThreadCount(1)
+        self._export_jobs = {}  # job_id -> (ExportJob, QListWidgetItem)
+        self._finished_jobs = set()  # завершённые, но ещё показанные в панели
+        self._next_job_id = 0
 
         self.setWindowTitle("HR: Панель управления")
         self.setFont(QFont("Segoe UI", 10))
@@ -53,7 +91,7 @@ class HRDashboardWidget(QWidget):
         self.search.setPlaceholderText("Поиск по ID, ФИО или логину")
         self.search.setClearButtonEnabled(True)
         self.search.setFixedHeight(32)
-        self.search.textChanged.connect(self.refresh)
+        self.search.textChanged.connect(self._search_timer.start)
 
         tf_layout.addWidget(icon_label('search', 20))
         tf_layout.addWidget(self.search)
@@ -84,26 +122,63 @@ class HRDashboardWidget(QWidget):
 
         main_layout.addWidget(top_frame)
 
+        # Фильтры по загруженным строкам (без запросов к БД)
+        filter_layout = QHBoxLayout()
+        filter_layout.setSpacing(8)
+        self.filter_position = QComboBox()
+        self.filter_position.setMinimumWidth(160)
+        self._load_positions()
+        self.filter_position.currentIndexChanged.connect(self.apply_filters)
+        filter_layout.addWidget(self.filter_position)
+        filter_layout.addWidget(QLabel("Приняты с"))
+        self.filter_hired_from = self._date_filter_edit()
+        filter_layout.addWidget(self.filter_hired_from)
+        filter_layout.addWidget(QLabel("по"))
+        self.filter_hired_to = self._date_filter_edit()
+        filter_layout.addWidget(self.filter_hired_to)
+        filter_layout.addWidget(QLabel("Отпуск от (дн.)"))
+        self.filter_vacation = QSpinBox()
+        self.filter_vacation.setRange(0, 366)
+        self.filter_vacation.setSpecialValueText("—")
+        self.filter_vacation.valueChanged.connect(self.apply_filters)
+        filter_layout.addWidget(self.filter_vacation)
+        btn_reset_filters = QPushButton(icon('times'), "")
+        btn_reset_filters.setToolTip("Сбросить фильтры")
+        btn_reset_filters.setFixedSize(28, 28)
+        btn_reset_filters.clicked.connect(self.reset_filters)
+        filter_layout.addWidget(btn_reset_filters)
+        main_layout.addLayout(filter_layout)
+
         # Таблица
         self.table = QTableView()
         self.table.setAlternatingRowColors(True)
         self.table.setSelectionBehavior(QTableView.SelectRows)
+        # Несколько строк (Ctrl/Shift) — для пакетного изменения и удаления
+        self.table.setSelectionMode(QTableView.ExtendedSelection)
         self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.verticalHeader().setVisible(False)
+        self.table.setIconSize(avatar_size())
         self.table.doubleClicked.connect(self.view_emp)
 
-        # Модель и настройки так, чтобы текст не урезался
+        # Модель и настройки так, чтобы текст не урезался.
+        # Сортировка и фильтры — в прокси; при неполной загрузке сортирует SQL
         self.model = EmployeeTableModel([])
-        self.table.setModel(self.model)
-
-        # Включаем перенос строк и отключаем обрезку текста
+        self.proxy = EmployeeFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.sql_reload_requested.connect(self.refresh)
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
+
+        # Включаем перенос строк; обрезается только текст шире MAX_COLUMN_WIDTH
         self.table.setWordWrap(True)
-        self.table.setTextElideMode(Qt.ElideNone)
+        self.table.setTextElideMode(Qt.ElideRight)
 
-        # Автоматически подгоняем ширину столбцов под содержимое
+        # Ширины столбцов — по самым длинным значениям и выборке строк,
+        # пересчёт только при появлении более длинных значений
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
         header.setStretchLastSection(True)
+        self.header_sizer = ContentHeaderSizer(self.table)
 
         # Стилизация таблицы
         self.table.setStyleSheet("""
@@ -119,6 +194,21 @@ class HRDashboardWidget(QWidget):
         """)
         main_layout.addWidget(self.table)
 
+        # Панель фоновых экспортов (видна, пока есть задачи)
+        self.jobs_frame = QFrame()
+        jobs_layout = QHBoxLayout(self.jobs_frame)
+        jobs_layout.setContentsMargins(0, 0, 0, 0)
+        jobs_layout.setSpacing(12)
+        self.jobs_list = QListWidget()
+        self.jobs_list.setMaximumHeight(90)
+        jobs_layout.addWidget(self.jobs_list)
+        btn_cancel_job = QPushButton(icon('times'), "Отменить экспорт")
+        btn_cancel_job.setToolTip("Отменить выбранный экспорт")
+        btn_cancel_job.clicked.connect(self.cancel_export)
+        jobs_layout.addWidget(btn_cancel_job, alignment=Qt.AlignTop)
+        self.jobs_frame.hide()
+        main_layout.addWidget(self.jobs_frame)
+
         # Кнопки просмотра/редактирования/удаления
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(12)
@@ -135,110 +225,307 @@ class HRDashboardWidget(QWidget):
         btn_edit.clicked.connect(self.edit_emp)
         btn_layout.addWidget(btn_edit)
 
+        btn_bulk = QPushButton(icon('users-cog'), "")
+        btn_bulk.setToolTip("Изменить выбранных")
+        btn_bulk.setFixedSize(32, 32)
+        btn_bulk.clicked.connect(self.bulk_edit)
+        btn_layout.addWidget(btn_bulk)
+        btn_accrue = QPushButton(icon('calendar-plus'), "")
+        btn_accrue.setToolTip("Начислить отпуск за год")
+        btn_accrue.setFixedSize(32, 32)
+        btn_accrue.clicked.connect(self.accrue_vacation)
+        btn_layout.addWidget(btn_accrue)
+
         btn_del = QPushButton(icon('trash'), "")
-        btn_del.setToolTip("Удалить")
+        btn_del.setToolTip("Удалить выбранных")
         btn_del.setFixedSize(32, 32)
         btn_del.clicked.connect(self.del_emp)
         btn_layout.addWidget(btn_del)
 
         main_layout.addLayout(btn_layout)
 
+        # Изменения сотрудников (в том числе из других окон) правят таблицу на месте
+        employee_events().changed.connect(self._on_employee_event)
+
         # Загрузка данных
         self.refresh()
 
     def refresh(self):
-        """Обновить таблицу по текущему фильтру."""
+        """
+        Обновить таблицу по текущему фильтру: первая страница грузится
+        в фоновом потоке, остальные — по прокрутке.
+        """
+        self._search_timer.stop()
+        search = self.search.text()
+        sort = self._current_sort()
+        flt = self.proxy.current_filter()
+        self._search_generation += 1
+        # Ещё не начатые запросы больше не нужны
+        for generation, queued in list(self._search_jobs.items()):
+            if self._search_pool.tryTake(queued):
+                del self._search_jobs[generation]
+        job = Worker(
+            (self._search_generation, search, sort, flt), self._fetch_page, search, None, sort, flt
+        )
+        job.signals.finished.connect(self._on_page_loaded)
+        job.signals.failed.connect(self._on_page_failed)
+        self._search_jobs[self._search_generation] = job
+        self._search_pool.start(job)
+
+    def _current_sort(self):
+        """Порядок таблицы для SQL (None — по возрастанию ID)."""
+        column = self.proxy.sortColumn()
+        if column < 0:
+            return None
+        return EmployeeSort(SORT_FIELDS[column], self.proxy.sortOrder() == Qt.DescendingOrder)
+
+    def _on_page_loaded(self, tag, page):
+        generation, search, sort, flt = tag
+        self._search_jobs.pop(generation, None)
+        if generation != self._search_generation:
+            logger.debug(f"Discarded stale search result (filter='{search}')")
+            return
+        self.model.update_page(
+            page,
+            lambda after_id: self._fetch_page(search, after_id, sort, flt),
+            SORT_FIELDS.index(sort.field) if sort else 0,
+            sort.descending if sort else False,
+            flt,
+        )
+        logger.info(
+            f"Loaded {len(page.items)} of ~{page.total_estimate} employees (filter='{search}')"
+        )
+
+    def _on_page_failed(self, tag, message):
+        generation = tag[0]
+        self._search_jobs.pop(generation, None)
+        if generation != self._search_generation:
+            return
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить список:\n{message}")
+
+    def _fetch_page(self, search, after_id, sort=None, flt=None):
+        """Загрузить страницу после after_id (первую — при after_id=None)."""
+        with SessionLocal() as db:
+            return EmployeeService(db).list_rows_page(search, after_id=after_id, sort=sort, flt=flt)
+
+    def _load_positions(self):
+        """Заполнить список должностей фильтра, сохранив выбранную."""
+        current = self.filter_position.currentData()
         try:
-            with SessionLocal() as db:
-                service = EmployeeService(db)
-                emps = service.list(self.search.text())
-            self.model.update(emps)
-            logger.info(f"Loaded {len(emps)} employees (filter='{self.search.text()}')")
+            with self.session.unit() as db:
+                positions = list_positions(db)
         except Exception as e:
-            logger.error(f"Error loading employees: {e}")
-            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить список:\n{e}")
+            logger.error(f"Error loading positions: {e}")
+            positions = []
+        self.filter_position.blockSignals(True)
+        self.filter_position.clear()
+        self.filter_position.addItem("Все должности", "")
+        for position in positions:
+            self.filter_position.addItem(position, position)
+        index = self.filter_position.findData(current) if current else 0
+        self.filter_position.setCurrentIndex(max(index, 0))
+        self.filter_position.blockSignals(False)
+
+    def _date_filter_edit(self):
+        edit = QDateEdit()
+        edit.setCalendarPopup(True)
+        edit.setDisplayFormat("dd.MM.yyyy")
+        edit.setMinimumDate(NO_DATE)
+        edit.setSpecialValueText("—")
+        edit.setDate(NO_DATE)
+        edit.dateChanged.connect(self.apply_filters)
+        return edit
+
+    def apply_filters(self):
+        """Применить фильтры панели к уже загруженным строкам."""
+        def date_value(edit):
+            return None if edit.date() == NO_DATE else edit.date().toPyDate()
+        self.proxy.set_filter(EmployeeFilter(
+            position=self.filter_position.currentData() or "",
+            hired_from=date_value(self.filter_hired_from),
+            hired_to=date_value(self.filter_hired_to),
+            min_vacation_days=self.filter_vacation.value() or None,
+        ))
+
+    def reset_filters(self):
+        # Сбрасываем все поля разом, чтобы фильтр применился один раз
+        editors = (self.filter_position, self.filter_hired_from, self.filter_hired_to, self.filter_vacation)
+        for editor in editors:
+            editor.blockSignals(True)
+        self.filter_position.setCurrentIndex(0)
+        self.filter_hired_from.setDate(NO_DATE)
+        self.filter_hired_to.setDate(NO_DATE)
+        self.filter_vacation.setValue(0)
+        for editor in editors:
+            editor.blockSignals(False)
+        self.apply_filters()
 
     def get_selected_id(self):
         idx = self.table.currentIndex()
-        return None if not idx.isValid() else self.model._employees[idx.row()].id
+        return None if not idx.isValid() else self.proxy.employee_id(idx.row())
+
+    def get_selected_ids(self):
+        """ID всех выделенных сотрудников (в порядке строк таблицы)."""
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [self.proxy.employee_id(row) for row in rows]
 
     def view_emp(self, index=None):
         emp_id = self.get_selected_id()
         if not emp_id:
             return
         try:
-            with SessionLocal() as db:
-                emp = get_employee(db, emp_id)
+            # Сотрудник из кэша окна передаётся карточке — она его не перечитывает
+            emp = self.session.employee(emp_id)
             if self.profile_window:
                 self.profile_window.close()
             self.profile_window = EmployeeProfileWidget(
                 emp.user,
                 on_logout=self.on_logout,
-                show_logout=False
+                show_logout=False,
+                current_user=self.user,
+                emp=emp,
             )
             self.profile_window.show()
         except Exception as e:
             logger.error(f"Error opening profile: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось открыть профиль:\n{e}")
 
+    def apply_change(self, emp_id):
+        """
+        Перечитать одного сотрудника и обновить, вставить или убрать
+        только его строку (с учётом текущего фильтра).
+        """
+        try:
+            with self.session.unit() as db:
+                row = get_employee_row(db, emp_id, self.search.text())
+        except Exception as e:
+            logger.error(f"Error reloading employee {emp_id}: {e}")
+            self.refresh()
+            return
+        if row is None:
+            self.model.remove_ids([emp_id])
+        else:
+            self.model.upsert(row)
+
+    def _on_employee_event(self, event):
+        """Событие шины: меняется только строка затронутого сотрудника."""
+        position = event.fields.get("position")
+        if event.kind == EMPLOYEES_RELOAD or (position and self.filter_position.findData(position) < 0):
+            self._load_positions()
+        if event.kind == EMPLOYEES_RELOAD:
+            self.refresh()
+        elif event.kind == EMPLOYEE_DELETED:
+            self.model.remove_ids([event.emp_id])
+        elif event.kind == EMPLOYEE_CREATED:
+            self.apply_change(event.emp_id)
+        elif event.kind == EMPLOYEE_UPDATED and TABLE_FIELDS.intersection(event.fields):
+            self.apply_change(event.emp_id)
+
     def add_emp(self):
+        # Новая строка появится по событию EMPLOYEE_CREATED
         from ui.register_widget import RegisterWidget
-        dlg = RegisterWidget(self)
-        if dlg.exec_() == dlg.Accepted:
-            self.refresh()
+        RegisterWidget(self).exec_()
 
     def edit_emp(self):
         emp_id = self.get_selected_id()
         if not emp_id:
             return
         from ui.edit_widget import EditWidget
-        dlg = EditWidget(emp_id, self)
-        if dlg.exec_() == dlg.Accepted:
-            self.refresh()
+        try:
+            emp = self.session.employee(emp_id)
+        except Exception as e:
+            logger.error(f"Error loading employee {emp_id}: {e}")
+            QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить сотрудника:\n{e}")
+            return
+        EditWidget(emp_id, self, emp=emp).exec_()
 
     def del_emp(self):
-        emp_id = self.get_selected_id()
-        if not emp_id:
+        emp_ids = self.get_selected_ids()
+        if not emp_ids:
             return
         # Подтверждение удаления
+        question = (
+            f"Удалить сотрудника {emp_ids[0]}?" if len(emp_ids) == 1
+            else f"Удалить выбранных сотрудников ({len(emp_ids)})?"
+        )
         reply = QMessageBox.question(
-            self, "Подтверждение удаления",
-            f"Удалить сотрудника {emp_id}?",
+            self, "Подтверждение удаления", question,
             QMessageBox.Yes | QMessageBox.No
         )
         if reply != QMessageBox.Yes:
             return
 
         try:
-            # Удаляем из БД
-            with SessionLocal() as db:
-                service = EmployeeService(db)
-                service.delete(emp_id)
-
-            # Удаляем аватар
-            photo_path = os.path.join(PROFILE_PHOTOS_DIR, f"{emp_id}.jpg")
-            if os.path.exists(photo_path):
-                try:
-                    os.remove(photo_path)
-                except Exception as e:
-                    logger.warning(f"Не удалось удалить аватар {photo_path}: {e}")
-
-            # Удаляем папку с документами
-            docs_dir = os.path.join(EMPLOYEE_DOCS_DIR, str(emp_id))
-            if os.path.isdir(docs_dir):
-                try:
-                    shutil.rmtree(docs_dir)
-                except Exception as e:
-                    logger.warning(f"Не удалось удалить папку документов {docs_dir}: {e}")
-
-            notify_qt("HR", f"Сотрудник {emp_id} удалён")
-            self.refresh()
+            # Удаляем из БД одним пакетом; строки таблицы уберут события шины
+            with self.session.unit() as db:
+                deleted = EmployeeService(db).delete_many(emp_ids)
         except Exception as e:
-            logger.error(f"Error deleting employee: {e}")
+            logger.error(f"Error deleting employees: {e}")
             QMessageBox.critical(self, "Ошибка", f"Не удалось удалить:\n{e}")
+            return
+
+        # Фото, миниатюры и документы — после коммита, одним проходом
+        remove_photos(deleted.ids)
+        try:
+            document_store().remove_employees(deleted.ids, deleted.digests)
+        except Exception as e:
+            logger.warning(f"Не удалось удалить документы сотрудников: {e}")
+
+    def bulk_edit(self):
+        """Присвоить одно значение поля всем выбранным сотрудникам."""
+        emp_ids = self.get_selected_ids()
+        if not emp_ids:
+            return
+        labels = [label for label, _ in BULK_EDIT_FIELDS]
+        label, ok = QInputDialog.getItem(
+            self, "Изменить выбранных", f"Поле (сотрудников: {len(emp_ids)}):", labels, 0, False
+        )
+        if not ok:
+            return
+        field = dict(BULK_EDIT_FIELDS)[label]
+        if field == "vacation_days_left":
+            value, ok = QInputDialog.getInt(self, "Изменить выбранных", f"{label}:", 0, 0, 365)
+        else:
+            value, ok = QInputDialog.getText(self, "Изменить выбранных", f"{label}:")
+            value = value.strip()
+            ok = ok and bool(value)
+        if not ok:
+            return
+        try:
+            with self.session.unit() as db:
+                EmployeeService(db).update_many(emp_ids, **{field: value})
+        except Exception as e:
+            logger.error(f"Error updating employees: {e}")
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить:\n{e}")
+
+    def accrue_vacation(self):
+        """Начислить отпуск всем сотрудникам за год (сначала — пробный прогон)."""
+        year = QDate.currentDate().year()
+        year, ok = QInputDialog.getInt(self, "Начисление отпуска", "Год:", year, 1900, year + 1)
+        if not ok:
+            return
+        try:
+            with self.session.unit() as db:
+                dry = plan(db, year, DEFAULT_POLICY)
+            if not dry.affected:
+                QMessageBox.information(self, "Начисление отпуска", f"За {year} год начислять некому.")
+                return
+            reply = QMessageBox.question(
+                self, "Начисление отпуска",
+                f"Начислить отпуск за {year} год ({dry.policy}):\n"
+                f"сотрудников — {dry.affected}, всего дней — {dry.added_days}?",
+                QMessageBox.Yes | QMessageBox.No,
+            )
+            if reply != QMessageBox.Yes:
+                return
+            with self.session.unit() as db:
+                accrue(db, year, DEFAULT_POLICY)
+        except Exception as e:
+            logger.error(f"Error accruing vacation: {e}")
+            QMessageBox.critical(self, "Ошибка", f"Не удалось начислить отпуск:\n{e}")
 
     def export(self, fmt):
-        """Экспорт текущего (отфильтрованного) списка."""
+        """Поставить в очередь фоновый экспорт текущего (отфильтрованного) списка."""
         filters = "PDF Files (*.pdf)" if fmt == 'pdf' else "Excel Files (*.xlsx)"
         default_ext = ".pdf" if fmt == 'pdf' else ".xlsx"
         caption = "Сохранить отчёт"
@@ -248,15 +535,70 @@ class HRDashboardWidget(QWidget):
         if not path.lower().endswith(default_ext):
             path += default_ext
 
-        try:
-            with SessionLocal() as db:
-                service = EmployeeService(db)
-                emps = service.list(self.search.text())
-            if fmt == 'pdf':
-                export_employees_pdf(path, emps)
-            else:
-                export_employees_excel(path, emps)
-            notify_qt("HR", f"Отчёт сохранён: {path}")
-        except Exception as e:
-            logger.error(f"Error exporting ({fmt}): {e}")
-            QMessageBox.critical(self, "Ошибка", f"Не удалось экспортировать:\n{e}")
+        self._next_job_id += 1
+        job = ExportJob(self._next_job_id, fmt, path, self.search.text(), self.proxy.current_filter())
+        job.signals.progress.connect(self._on_export_progress)
+        job.signals.finished.connect(self._on_export_finished)
+        job.signals.failed.connect(self._on_export_failed)
+        job.signals.cancelled.connect(self._on_export_cancelled)
+        item = QListWidgetItem()
+        item.setData(Qt.UserRole, job.job_id)
+        self.jobs_list.addItem(item)
+        self._export_jobs[job.job_id] = (job, item)
+        self._set_job_text(job.job_id, "в очереди")
+        self.jobs_frame.show()
+        self._export_pool.start(job)
+        logger.info(f"Export queued ({fmt}): {path}")
+
+    def cancel_export(self):
+        item = self.jobs_list.currentItem()
+        if not item:
+            return
+        job_id = item.data(Qt.UserRole)
+        if job_id not in self._export_jobs or job_id in self._finished_jobs:
+            return
+        job, _ = self._export_jobs[job_id]
+        if self._export_pool.tryTake(job):
+            # Задача ещё не начиналась
+            self._on_export_cancelled(job_id)
+        else:
+            job.cancel()
+            self._set_job_text(job_id, "отмена…")
+
+    def _set_job_text(self, job_id, state):
+        job, item = self._export_jobs[job_id]
+        item.setText(f"{job.fmt.upper()} {os.path.basename(job.path)} — {state}")
+
+    def _finish_job(self, job_id, state):
+        if job_id not in self._export_jobs:
+            return
+        self._finished_jobs.add(job_id)
+        self._set_job_text(job_id, state)
+        QTimer.singleShot(EXPORT_DONE_VISIBLE_MS, lambda: self._remove_job(job_id))
+
+    def _remove_job(self, job_id):
+        job, item = self._export_jobs.pop(job_id, (None, None))
+        self._finished_jobs.discard(job_id)
+        if item is not None:
+            self.jobs_list.takeItem(self.jobs_list.row(item))
+        if not self._export_jobs:
+            self.jobs_frame.hide()
+
+    def _on_export_progress(self, job_id, done, total):
+        if job_id not in self._export_jobs:
+            return
+        percent = int(done * 100 / total) if total else 100
+        self._set_job_text(job_id, f"{percent}% ({done}/{total})")
+
+    def _on_export_finished(self, job_id, rows):
+        job, _ = self._export_jobs[job_id]
+        self._finish_job(job_id, f"готово, строк: {rows}")
+        notify_qt("HR", f"Отчёт сохранён: {job.path}")
+
+    def _on_export_failed(self, job_id, message):
+        job, _ = self._export_jobs[job_id]
+        self._finish_job(job_id, "ошибка")
+        QMessageBox.critical(self, "Ошибка", f"Не удалось экспортировать:\n{message}")
+
+    def _on_export_cancelled(self, job_id):
+        self._finish_job(job_id, "отменён")
@@ -2,12 +2,13 @@
 
 import logging
 from PyQt5.QtWidgets import (
-    QWidget, QFormLayout, QLineEdit, QPushButton, QMessageBox, QLabel
+    QWidget, QFormLayout, QLineEdit, QPushButton, QMessageBox, QLabel, QProgressBar
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThreadPool
 from qt_material import apply_stylesheet
 from ui.utils import icon, icon_label
+from ui.workers import Worker
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ class LoginWidget(QWidget):
 
         # Оформление окна
         self.setWindowTitle("Вход в HR‑систему")
-        self.setFixedSize(320, 200)
+        self.setFixedSize(320, 220)
         apply_stylesheet(self, theme="light_blue.xml")
         self.setFont(QFont("Segoe UI", 10))
 
@@ -39,7 +40,7 @@ class LoginWidget(QWidget):
         layout.addRow(icon_label("lock", 24), self.le_pwd)
 
         # Кнопка входа
-        btn = QPushButton(icon("sign-in-alt"), "Войти")
+        self.btn_login = btn = QPushButton(icon("sign-in-alt"), "Войти")
         btn.setCursor(Qt.PointingHandCursor)
         btn.setFixedHeight(32)
         btn.setStyleSheet(
@@ -47,27 +48,53 @@ class LoginWidget(QWidget):
             "QPushButton:hover { background: #1e88e5; }"
         )
         btn.clicked.connect(self._on_login_clicked)
+        # Enter в поле пароля — тоже вход
+        self.le_pwd.returnPressed.connect(self._on_login_clicked)
 
         # Центрируем кнопку под полями
         layout.addRow(QLabel(), btn)
 
+        # Индикатор проверки пароля (bcrypt выполняется в фоне)
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        self.progress.setFixedHeight(6)
+        self.progress.setTextVisible(False)
+        self.progress.hide()
+        layout.addRow(self.progress)
+
+        self._auth_job = None
+
     def _on_login_clicked(self):
+        if self._auth_job is not None:
+            return
         username = self.le_user.text().strip()
         password = self.le_pwd.text()
         if not username or not password:
             QMessageBox.warning(self, "Ошибка", "Введите логин и пароль")
             return
 
-        try:
-            from database import SessionLocal
-            from auth import authenticate
-            with SessionLocal() as db:
-                user = authenticate(db, username, password)
-        except Exception as e:
-            logger.error(f"Ошибка при попытке входа: {e}")
-            QMessageBox.critical(self, "Ошибка", f"Сбой при подключении к БД:\n{e}")
-            return
+        # Проверка пароля занимает заметное время — уводим её из GUI-потока
+        self._auth_job = Worker(username, _authenticate, username, password)
+        self._auth_job.signals.finished.connect(self._on_auth_finished)
+        self._auth_job.signals.failed.connect(self._on_auth_failed)
+        self._set_busy(True)
+        QThreadPool.globalInstance().start(self._auth_job)
 
+    def _set_busy(self, busy: bool):
+        self.le_user.setEnabled(not busy)
+        self.le_pwd.setEnabled(not busy)
+        self.btn_login.setEnabled(not busy)
+        self.btn_login.setText("Проверка…" if busy else "Войти")
+        self.progress.setVisible(busy)
+
+    def _on_auth_failed(self, username, message):
+        self._auth_job = None
+        self._set_busy(False)
+        QMessageBox.critical(self, "Ошибка", f"Сбой при подключении к БД:\n{message}")
+
+    def _on_auth_finished(self, username, user):
+        self._auth_job = None
+        self._set_busy(False)
         if not user:
             QMessageBox.warning(self, "Ошибка", "Неверный логин или пароль")
             return
@@ -78,3 +105,10 @@ class LoginWidget(QWidget):
         self.le_pwd.clear()
         # Вызываем коллбэк успешного входа
         self.on_success(user)
+
+def _authenticate(username: str, password: str):
+    """Аутентификация в собственной сессии (выполняется в фоновом потоке)."""
+    from database import SessionLocal
+    from auth import authenticate
+    with SessionLocal() as db:
+        return authenticate(db, username, password)
@@ -1,58 +1,263 @@
 # ui/models_table.py
 
-from PyQt5.QtCore import Qt, QAbstractTableModel, QVariant
+import logging
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+from controllers import NO_FILTER
+from ui.photos import AVATAR_SIZE, photo_pixmap
+
+logger = logging.getLogger(__name__)
+
+# Поле controllers.SORT_FIELDS для каждой колонки (ФИО сортируется по фамилии)
+SORT_FIELDS = ("id", "username", "last_name", "position", "hire_date", "vacation_days_left")
+
+# Колонка ФИО показывает аватар сотрудника
+AVATAR_COLUMN = 2
+
+def _sort_value(value):
+    # NULL меньше любого значения — так же, как сортирует SQLite
+    return (0,) if value is None else (1, value)
+
+class DisplayRow:
+    """
+    Готовые к показу значения одной строки таблицы.
+    Форматирование выполняется один раз при загрузке строки,
+    а data() лишь берёт значение по индексу колонки.
+    keys — заранее вычисленные ключи сортировки по колонкам
+    (в том же порядке, что ORDER BY в controllers), hire_date — дата для фильтра.
+    """
+    __slots__ = ("id", "values", "keys", "hire_date")
+
+    def __init__(self, emp):
+        self.id = emp.id
+        self.values = (
+            emp.id,
+            emp.username,
+            f"{emp.first_name} {emp.last_name}",
+            emp.position,
+            # Формат дд.мм.гггг
+            emp.hire_date.strftime("%d.%m.%Y") if emp.hire_date else "",
+            emp.vacation_days_left,
+        )
+        self.keys = tuple(_sort_value(getattr(emp, field)) for field in SORT_FIELDS)
+        self.hire_date = emp.hire_date
+
+    def sort_key(self, column: int):
+        """Ключ строки при сортировке по колонке column (при равенстве — по ID)."""
+        return self.keys[column], self.id
 
 class EmployeeTableModel(QAbstractTableModel):
     """
     Табличная модель сотрудников с колонками:
     ID, Логин, ФИО, Должность, Дата приёма, Отпуск (дн.).
+    Строки — результаты controllers.list_employee_rows_page
+    (id, username, first_name, last_name, position, hire_date, vacation_days_left),
+    которые при загрузке превращаются в DisplayRow с готовыми значениями.
+
+    Поддерживает ленивую подгрузку: если модели передан fetch_page,
+    следующие страницы запрашиваются через canFetchMore/fetchMore
+    только тогда, когда QTableView докручивается до конца загруженных строк.
+
+    Строки упорядочены по ID или, если страницы запрошены с сортировкой,
+    по ключу колонки sort_column (см. update_page); upsert/remove_ids меняют
+    отдельные строки сигналами insert/remove/dataChanged, не сбрасывая
+    выделение и прокрутку.
     """
     headers = ["ID", "Логин", "ФИО", "Должность", "Дата приёма", "Отпуск (дн.)"]
 
     def __init__(self, employees=None):
         super().__init__()
-        self._employees = employees or []
+        self._rows = [DisplayRow(e) for e in employees or []]
+        # ID сотрудника → номер строки
+        self._row_of = {}
+        self._reindex()
+        # fetch_page(after_id) -> EmployeePage; None — подгрузки нет
+        self._fetch_page = None
+        self._cursor = None
+        self.total_estimate = None
+        # Порядок строк: колонка и направление (колонка 0 — по ID)
+        self.sort_column = 0
+        self.sort_descending = False
+        # Фильтр EmployeeFilter, с которым строки выбраны в SQL
+        self.loaded_filter = NO_FILTER
+        # Самый длинный текст каждой колонки среди загруженных строк —
+        # по нему ui.header_sizing считает ширины без обхода всех строк
+        self._longest = [""] * len(self.headers)
+        self._track(self._rows)
 
-    def rowCount(self, parent=None):
-        return len(self._employees)
+    def _track(self, rows, reset: bool = False):
+        """Обновляет самые длинные тексты колонок по строкам rows."""
+        if reset:
+            self._longest = [""] * len(self.headers)
+        longest = self._longest
+        for row in rows:
+            for column, value in enumerate(row.values):
+                text = "" if value is None else str(value)
+                if len(text) > len(longest[column]):
+                    longest[column] = text
 
-    def columnCount(self, parent=None):
+    def longest_texts(self):
+        """Самый длинный отображаемый текст каждой колонки (загруженные строки)."""
+        return list(self._longest)
+
+    def rowCount(self, parent=QModelIndex()):
+        # Для табличной модели у дочерних индексов строк нет
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
         return len(self.headers)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid() or role != Qt.DisplayRole:
+        if not index.isValid():
+            return QVariant()
+        if role == Qt.DecorationRole and index.column() == AVATAR_COLUMN:
+            # Миниатюра из QPixmapCache; только для видимых строк
+            pixmap = photo_pixmap(self._rows[index.row()].id, AVATAR_SIZE)
+            return QVariant() if pixmap is None else pixmap
+        if role != Qt.DisplayRole:
             return QVariant()
 
-        emp = self._employees[index.row()]
-        col = index.column()
-
-        if col == 0:
-            return emp.id
-        elif col == 1:
-            return emp.user.username
-        elif col == 2:
-            return f"{emp.first_name} {emp.last_name}"
-        elif col == 3:
-            return emp.position
-        elif col == 4:
-            # Формат дд.мм.гггг
-            if emp.hire_date:
-                return emp.hire_date.strftime("%d.%m.%Y")
-            return ""
-        elif col == 5:
-            return emp.vacation_days_left
-
-        return QVariant()
+        value = self._rows[index.row()].values[index.column()]
+        return QVariant() if value is None else value
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
             return self.headers[section]
         return QVariant()
 
-    def update(self, employees):
+    def update_page(
+        self, page, fetch_page, sort_column: int = 0, sort_descending: bool = False, flt=NO_FILTER
+    ):
         """
-        Обновляет список сотрудников и перерисовывает таблицу.
+        Загружает первую страницу (EmployeePage) и запоминает,
+        как получать следующие: fetch_page(after_id) -> EmployeePage.
+        sort_column/sort_descending — порядок, в котором fetch_page отдаёт строки,
+        flt — фильтр EmployeeFilter, с которым они выбраны.
         """
         self.beginResetModel()
-        self._employees = employees
+        self._rows = [DisplayRow(e) for e in page.items]
+        self._row_of = {}
+        self._reindex()
+        self._track(self._rows, reset=True)
+        self._cursor = page.next_cursor
+        self._fetch_page = fetch_page if page.next_cursor is not None else None
+        self.total_estimate = page.total_estimate
+        self.sort_column = sort_column
+        self.sort_descending = sort_descending
+        self.loaded_filter = flt
         self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent is not None and parent.isValid():
+            return False
+        return self._fetch_page is not None and self._cursor is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        try:
+            page = self._fetch_page(self._cursor)
+        except Exception as e:
+            # Не даём представлению бесконечно повторять неудачный запрос
+            logger.error(f"Ошибка подгрузки страницы сотрудников: {e}")
+            self._fetch_page = None
+            return
+        self._cursor = page.next_cursor
+        if page.next_cursor is None:
+            self._fetch_page = None
+        if not page.items:
+            return
+        rows = [DisplayRow(e) for e in page.items]
+        self._track(rows)
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self._reindex(first)
+        self.endInsertRows()
+
+    def employee_id(self, row: int) -> int:
+        """ID сотрудника в строке row."""
+        return self._rows[row].id
+
+    def display_row(self, row: int) -> DisplayRow:
+        """Подготовленная строка row — для прокси сортировки и фильтров."""
+        return self._rows[row]
+
+    def _reindex(self, start: int = 0):
+        """Обновляет номера строк начиная со start (строки до start не сдвигались)."""
+        row_of = self._row_of
+        for row in range(start, len(self._rows)):
+            row_of[self._rows[row].id] = row
+
+    def row_of(self, emp_id: int):
+        """Номер строки сотрудника emp_id или None, если он не загружен."""
+        return self._row_of.get(emp_id)
+
+    def _precedes(self, a: DisplayRow, b: DisplayRow) -> bool:
+        """Идёт ли строка a раньше b в порядке загрузки страниц."""
+        ka, kb = a.sort_key(self.sort_column), b.sort_key(self.sort_column)
+        return ka > kb if self.sort_descending else ka < kb
+
+    def _insert_position(self, new: DisplayRow) -> int:
+        lo, hi = 0, len(self._rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._precedes(self._rows[mid], new):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def update_row(self, row: int, emp):
+        """
+        Перестраивает кэш одной строки после редактирования
+        и перерисовывает только её.
+        """
+        self._rows[row] = DisplayRow(emp)
+        self._track(self._rows[row:row + 1])
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def upsert(self, emp):
+        """
+        Обновляет строку сотрудника emp (строка list_employee_rows_page)
+        или вставляет её на место в порядке загрузки. Сотрудник за курсором
+        подгрузки не вставляется — он придёт со следующей страницей.
+        """
+        new = DisplayRow(emp)
+        row = self.row_of(emp.id)
+        if row is not None:
+            old = self._rows[row]
+            if old.sort_key(self.sort_column) == new.sort_key(self.sort_column):
+                self.update_row(row, emp)
+                return
+            # Изменилось значение колонки сортировки — строка переезжает
+            self.remove_ids([emp.id])
+        if self._cursor is not None and self._rows and self._precedes(self._rows[-1], new):
+            return
+        self._track([new])
+        row = self._insert_position(new)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, new)
+        self._reindex(row)
+        self.endInsertRows()
+        if self.total_estimate is not None:
+            self.total_estimate += 1
+
+    def remove_ids(self, emp_ids):
+        """Удаляет строки сотрудников emp_ids (незагруженные пропускаются)."""
+        rows = sorted(
+            (r for r in map(self.row_of, set(emp_ids)) if r is not None),
+            reverse=True,
+        )
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._row_of[self._rows[row].id]
+            del self._rows[row]
+            self.endRemoveRows()
+        if rows:
+            # Номера строк после удалённых сдвинулись — пересчёт один раз
+            self._reindex(rows[-1])
+        if rows and self.total_estimate is not None:
+            self.total_estimate = max(0, self.total_estimate - len(rows))
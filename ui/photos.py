@@ -0,0 +1,185 @@
+# ui/photos.py
+"""
+Фото сотрудников и их уменьшенные копии.
+
+При загрузке фото (ingest_photo) один раз создаются: само фото, уменьшенное
+до PHOTO_MAX_SIZE, и миниатюры THUMB_SIZES — для карточки (100 px)
+и для аватара в строке таблицы. Карточка и таблица читают только
+миниатюры в несколько килобайт, а не исходные многомегапиксельные снимки.
+Готовые QPixmap лежат в QPixmapCache (LRU по объёму), так что повторный
+показ не обращается к диску. Отсутствие фото тоже запоминается
+(на MISSING_RECHECK_S), чтобы таблица не проверяла файл на каждой отрисовке.
+EMPLOYEES_RELOAD сбрасывает оба кэша — фото могли загрузить с другого места.
+
+Для фото, загруженных до появления миниатюр, миниатюры создаются
+при первом запросе.
+"""
+
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QImage, QImageReader, QPixmap, QPixmapCache
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PHOTOS_DIR = "profile_photos/"
+THUMBS_DIRNAME = "thumbs"
+
+# Размер фото в карточке и аватара в строке таблицы, px
+PROFILE_THUMB_SIZE = 100
+AVATAR_SIZE = 24
+THUMB_SIZES = (PROFILE_THUMB_SIZE, AVATAR_SIZE)
+# Большая сторона хранимого фото, px
+PHOTO_MAX_SIZE = 1024
+JPEG_QUALITY = 90
+
+# Объём QPixmapCache, КБ (аватар 24×24 — около 2 КБ, миниатюра 100×100 — около 40 КБ)
+PIXMAP_CACHE_KB = 20 * 1024
+
+# Через сколько секунд снова проверять файл фото, которого не было
+MISSING_RECHECK_S = 60.0
+
+# ID сотрудника без фото → время проверки (сбрасывается при загрузке
+# и удалении фото и по EMPLOYEES_RELOAD)
+_missing: Dict[int, float] = {}
+# ID сотрудников, чьи миниатюры лежат в QPixmapCache
+_cached = set()
+_watching = False
+
+QPixmapCache.setCacheLimit(PIXMAP_CACHE_KB)
+
+def photo_path(emp_id: int, photos_dir: str = PROFILE_PHOTOS_DIR) -> str:
+    return os.path.join(photos_dir, f"{emp_id}.jpg")
+
+def thumb_path(emp_id: int, size: int, photos_dir: str = PROFILE_PHOTOS_DIR) -> str:
+    return os.path.join(photos_dir, THUMBS_DIRNAME, f"{emp_id}_{size}.jpg")
+
+def _cache_key(emp_id: int, size: int) -> str:
+    return f"photo:{emp_id}:{size}"
+
+def _read_scaled(path: str, size: int) -> QImage:
+    """
+    Читает изображение сразу уменьшенным так, чтобы большая сторона
+    была не больше size: JPEG декодируется в уменьшенном масштабе,
+    без распаковки полного кадра. Поворот по EXIF учитывается.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    original = reader.size()
+    if original.isValid() and max(original.width(), original.height()) > size:
+        reader.setScaledSize(original.scaled(size, size, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        raise OSError(f"Не удалось прочитать изображение {path}: {reader.errorString()}")
+    # Поворот по EXIF меняет стороны местами — подгоняем ещё раз
+    if max(image.width(), image.height()) > size:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+def _save(image: QImage, path: str):
+    """Сохраняет JPEG через временный файл, чтобы читатели не увидели недописанный."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    if not image.save(tmp, "JPG", JPEG_QUALITY):
+        raise OSError(f"Не удалось сохранить изображение {path}")
+    os.replace(tmp, path)
+
+def _write_thumbs(image: QImage, emp_id: int, photos_dir: str):
+    for size in THUMB_SIZES:
+        thumb = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        _save(thumb, thumb_path(emp_id, size, photos_dir))
+
+def invalidate(emp_id: int):
+    """Забыть кэшированные миниатюры сотрудника."""
+    _missing.pop(emp_id, None)
+    _cached.discard(emp_id)
+    for size in THUMB_SIZES:
+        QPixmapCache.remove(_cache_key(emp_id, size))
+
+def invalidate_all():
+    """Забыть миниатюры и отметки «нет фото» всех сотрудников."""
+    _missing.clear()
+    for emp_id in list(_cached):
+        invalidate(emp_id)
+
+def _on_employee_event(event):
+    from events import EMPLOYEES_RELOAD
+    if event.kind == EMPLOYEES_RELOAD:
+        invalidate_all()
+
+def _watch_events():
+    """Подписаться на события сотрудников (один раз, в GUI-потоке)."""
+    global _watching
+    if not _watching:
+        _watching = True
+        from ui.event_bridge import employee_events
+        employee_events().changed.connect(_on_employee_event)
+
+def _is_missing(emp_id: int) -> bool:
+    checked = _missing.get(emp_id)
+    if checked is None:
+        return False
+    if time.monotonic() - checked < MISSING_RECHECK_S:
+        return True
+    del _missing[emp_id]
+    return False
+
+def ingest_photo(src: str, emp_id: int, photos_dir: str = PROFILE_PHOTOS_DIR):
+    """Сохраняет фото сотрудника (не больше PHOTO_MAX_SIZE) и его миниатюры."""
+    image = _read_scaled(src, PHOTO_MAX_SIZE)
+    _save(image, photo_path(emp_id, photos_dir))
+    _write_thumbs(image, emp_id, photos_dir)
+    invalidate(emp_id)
+
+def remove_photo(emp_id: int, photos_dir: str = PROFILE_PHOTOS_DIR):
+    """Удаляет фото сотрудника и его миниатюры."""
+    for path in [photo_path(emp_id, photos_dir)] + [
+        thumb_path(emp_id, size, photos_dir) for size in THUMB_SIZES
+    ]:
+        if os.path.exists(path):
+            os.remove(path)
+    invalidate(emp_id)
+
+def remove_photos(emp_ids, photos_dir: str = PROFILE_PHOTOS_DIR):
+    """Удаляет фото и миниатюры нескольких сотрудников; ошибки — в лог."""
+    for emp_id in emp_ids:
+        try:
+            remove_photo(emp_id, photos_dir)
+        except OSError as e:
+            logger.warning(f"Не удалось удалить фото сотрудника {emp_id}: {e}")
+
+def photo_pixmap(emp_id: int, size: int = PROFILE_THUMB_SIZE,
+                 photos_dir: str = PROFILE_PHOTOS_DIR) -> Optional[QPixmap]:
+    """Миниатюра фото размера size (один из THUMB_SIZES) или None, если фото нет."""
+    _watch_events()
+    if _is_missing(emp_id):
+        return None
+    key = _cache_key(emp_id, size)
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
+    path = thumb_path(emp_id, size, photos_dir)
+    if not os.path.exists(path):
+        original = photo_path(emp_id, photos_dir)
+        if not os.path.exists(original):
+            _missing[emp_id] = time.monotonic()
+            return None
+        try:
+            # Фото загружено до появления миниатюр — создаём их один раз
+            _write_thumbs(_read_scaled(original, max(THUMB_SIZES)), emp_id, photos_dir)
+        except OSError as e:
+            logger.warning(f"Миниатюры фото {original} не созданы: {e}")
+            _missing[emp_id] = time.monotonic()
+            return None
+    pixmap = QPixmap(path)
+    if pixmap.isNull():
+        return None
+    QPixmapCache.insert(key, pixmap)
+    _cached.add(emp_id)
+    return pixmap
+
+def avatar_size() -> QSize:
+    return QSize(AVATAR_SIZE, AVATAR_SIZE)
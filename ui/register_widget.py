@@ -1,6 +1,5 @@
 # ui/register_widget.py
 
-import re
 import logging
 from PyQt5.QtWidgets import (
     QLineEdit, QSpinBox, QDateEdit, QPushButton, QMessageBox, QLabel
@@ -9,6 +8,7 @@ from PyQt5.QtCore import QDate, Qt
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from database import SessionLocal
 from controllers import create_employee
+from validation import PASSPORT_REGEX, new_employee_error
 from ui.form_base import EmployeeFormDialog
 from main import DATE_FORMAT
 
@@ -71,7 +71,7 @@ class RegisterWidget(EmployeeFormDialog):
         ])
         self.apply_phone_validator([self.mobile, self.work])
         # Паспорт: 4 цифры, необязательный пробел, 6 цифр
-        self.apply_regex_validator([self.passport], r'^\d{4}\s?\d{6}$')
+        self.apply_regex_validator([self.passport], PASSPORT_REGEX)
 
         # Сборка формы
         self.add_form_row("Логин:",           self.username,   'user')
@@ -95,28 +95,6 @@ class RegisterWidget(EmployeeFormDialog):
         self.form.addRow(QLabel(), btn)
 
     def _on_submit(self):
-        # Проверка обязательных полей
-        for field, name in [
-            (self.username, "Логин"),
-            (self.password, "Пароль"),
-            (self.first_name, "Имя"),
-            (self.last_name, "Фамилия"),
-            (self.position, "Должность"),
-            (self.passport, "Паспорт")
-        ]:
-            if not field.text().strip():
-                self.show_warning("Ошибка", f"Пожалуйста, введите {name}.")
-                return
-
-        # Проверка пароля
-        pwd = self.password.text()
-        if len(pwd) < 8 or not re.search(r"\d", pwd) or not re.search(r"[A-Za-z]", pwd):
-            self.show_warning(
-                "Ошибка",
-                "Пароль должен быть не менее 8 символов и содержать буквы и цифры."
-            )
-            return
-
         # Формирование данных
         data = dict(
             first_name=self.first_name.text().strip(),
@@ -131,6 +109,16 @@ class RegisterWidget(EmployeeFormDialog):
             vacation_days_left=self.vacation.value()
         )
 
+        # Проверка обязательных полей, пароля и форматов
+        error = new_employee_error(dict(
+            data,
+            username=self.username.text().strip(),
+            password=self.password.text(),
+        ))
+        if error:
+            self.show_warning("Ошибка", error)
+            return
+
         # Сохранение в БД
         try:
             with SessionLocal() as db:
@@ -0,0 +1,44 @@
+# ui/session_scope.py
+"""
+Работа окна с БД: unit() — одна сессия на группу операций одного
+действия, employee()/employee_by_user() — сотрудники (с User,
+отсоединённые от сессии) через общий кэш EmployeeService.
+Только для GUI-потока: фоновые задачи открывают собственные сессии.
+"""
+
+from contextlib import contextmanager
+from typing import Optional
+
+from PyQt5.QtCore import QObject
+
+from database import SessionLocal
+from models import Employee
+from services.employee_service import EmployeeService
+
+class WindowSession(QObject):
+    @contextmanager
+    def unit(self):
+        """
+        Сессия на группу операций. При ошибке — откат. Объекты, загруженные
+        в ней, после выхода остаются читаемыми (expire_on_commit отключён).
+        """
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            yield db
+            if db.new or db.dirty or db.deleted:
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def employee(self, emp_id: int) -> Optional[Employee]:
+        """Сотрудник с User: из общего кэша или одним запросом."""
+        with self.unit() as db:
+            return EmployeeService(db).get(emp_id)
+
+    def employee_by_user(self, user_id: int) -> Optional[Employee]:
+        """Сотрудник пользователя user_id (через тот же кэш)."""
+        with self.unit() as db:
+            return EmployeeService(db).get_by_user(user_id)
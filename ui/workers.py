@@ -0,0 +1,41 @@
+# ui/workers.py
+
+import logging
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+class WorkerSignals(QObject):
+    """
+    Сигналы фоновой задачи. Объект живёт в GUI-потоке,
+    поэтому слоты виджетов вызываются через очередь событий.
+    finished(tag, result) / failed(tag, message)
+    """
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+
+class Worker(QRunnable):
+    """
+    Выполняет fn(*args, **kwargs) в QThreadPool.
+    tag возвращается вместе с результатом, чтобы получатель мог
+    отбросить ответ на устаревший запрос.
+    """
+    def __init__(self, tag, fn, *args, **kwargs):
+        super().__init__()
+        self.tag = tag
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        # Объект задачи живёт, пока на него ссылается Python: пул не удалит его
+        # после run(), и tryTake()/cancel() безопасны в любой момент
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.error(f"Ошибка фоновой задачи {self.tag}: {e}")
+            self.signals.failed.emit(self.tag, str(e))
+            return
+        self.signals.finished.emit(self.tag, result)
@@ -0,0 +1,50 @@
+# validation.py
+
+import re
+from typing import Optional
+
+# Телефон: необязательный +, затем 5–15 цифр
+PHONE_REGEX = r'^\+?\d{5,15}$'
+# Паспорт: 4 цифры, необязательный пробел, 6 цифр
+PASSPORT_REGEX = r'^\d{4}\s?\d{6}$'
+
+# Обязательные поля при регистрации сотрудника: (ключ, название для сообщения)
+REQUIRED_FIELDS = [
+    ("username", "Логин"),
+    ("password", "Пароль"),
+    ("first_name", "Имя"),
+    ("last_name", "Фамилия"),
+    ("position", "Должность"),
+    ("passport", "Паспорт"),
+]
+
+def password_error(password: str) -> Optional[str]:
+    """
+    Проверяет сложность пароля: не менее 8 символов, буквы и цифры.
+    Возвращает текст ошибки или None.
+    """
+    if len(password) < 8 or not re.search(r"\d", password) or not re.search(r"[A-Za-z]", password):
+        return "Пароль должен быть не менее 8 символов и содержать буквы и цифры."
+    return None
+
+def new_employee_error(fields: dict) -> Optional[str]:
+    """
+    Проверяет данные нового сотрудника (те же правила, что и у формы регистрации).
+    fields — словарь с ключами username, password и полями Employee.
+    Возвращает текст первой найденной ошибки или None.
+    """
+    for key, name in REQUIRED_FIELDS:
+        if not str(fields.get(key) or "").strip():
+            return f"Пожалуйста, введите {name}."
+
+    error = password_error(fields["password"])
+    if error:
+        return error
+
+    if not re.match(PASSPORT_REGEX, fields["passport"].strip()):
+        return "Паспорт должен быть в формате 1234 567890."
+    for key in ("phone_mobile", "phone_work"):
+        phone = (fields.get(key) or "").strip()
+        if phone and not re.match(PHONE_REGEX, phone):
+            return f"Некорректный номер телефона: {phone}"
+    return None